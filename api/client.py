@@ -0,0 +1,225 @@
+import os
+import re
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from monitoring.metrics import metrics as process_metrics
+
+API_URL = os.getenv("CLICKUP_API_URL", "https://api.clickup.com/api/v2").rstrip("/")
+
+# ClickUp allows 100 requests per minute and per token on most plans; the
+# X-RateLimit-* headers of each response override this once they are seen.
+RATE_LIMIT_PER_MINUTE = int(os.getenv("CLICKUP_RATE_LIMIT", "100"))
+MAX_RETRIES = int(os.getenv("CLICKUP_MAX_RETRIES", "5"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 60
+REQUEST_TIMEOUT = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ClickUpAPIError(Exception):
+    def __init__(self, status_code, text, path):
+        super().__init__(f"{path} → HTTP {status_code} : {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+        self.path = path
+
+
+def endpoint_of(path):
+    # "/list/901/task" → "/list/{id}/task": one latency series per endpoint, not per id
+    path = path[len(API_URL):] if path.startswith(API_URL) else path
+    return re.sub(r"/(team|space|folder|list|task)/[^/?]+", r"/\1/{id}", path.split("?")[0])
+
+
+def get_session(token, pool_size=10):
+    # One keep-alive pool shared by every worker thread of a crawl
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if token:
+        session.headers.update({"Authorization": token})
+    return session
+
+
+class RateLimiter:
+    """Token bucket shared by every thread using one ClickUp token.
+
+    Until the server has answered, the bucket refills steadily at ``limit``
+    tokens per minute. Once ``X-RateLimit-Remaining``/``X-RateLimit-Reset``
+    are known it follows them: the budget left is what the server says, and
+    the bucket is full again at the reset time. Concurrent workers can burst
+    up to that budget and all wait together when it runs out.
+    """
+
+    def __init__(self, limit=RATE_LIMIT_PER_MINUTE):
+        self._lock = threading.Lock()
+        self.limit = limit
+        self._tokens = float(limit)
+        self._updated = time.monotonic()
+        self._reset_at = None
+
+    def _refill(self, now):
+        if self._reset_at is None:
+            self._tokens = min(self.limit, self._tokens + (now - self._updated) * self.limit / 60)
+        elif now >= self._reset_at:
+            self._tokens = float(self.limit)
+            self._reset_at = None
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                if self._reset_at is not None:
+                    delay = self._reset_at - now
+                else:
+                    delay = (1 - self._tokens) * 60 / self.limit
+            time.sleep(delay)
+            waited += delay
+
+    def update(self, headers):
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and int(limit) > 0:
+                self.limit = int(limit)
+            if remaining is not None:
+                # Requests still in flight were already taken from the bucket
+                self._tokens = min(self._tokens, float(remaining))
+            if reset:
+                self._set_reset(float(reset), now)
+
+    def block_until(self, reset_epoch):
+        with self._lock:
+            self._tokens = 0.0
+            self._set_reset(reset_epoch, time.monotonic())
+
+    def _set_reset(self, reset_epoch, now):
+        # Reset is a unix timestamp; convert it to the monotonic clock
+        reset_at = now + max(0.0, reset_epoch - time.time())
+        self._reset_at = reset_at if self._reset_at is None else max(self._reset_at, reset_at)
+
+
+class ClickUpClient:
+    """Pooled, rate-limited and retrying access to the ClickUp API.
+
+    ``get`` returns the decoded JSON body or raises ClickUpAPIError. Throttled
+    responses (429) wait for the rate-limit reset, server errors and dropped
+    connections are retried with exponential backoff and full jitter, other
+    errors are raised at once. ``metrics`` separates the time spent waiting
+    for the rate limit or a retry from the time spent on useful requests.
+
+    ``token`` is a token string or a TokenManager: the manager is asked for
+    the token on every request, so a crawl picks up refreshed tokens, and a
+    401 renews it once before the request is retried.
+    """
+
+    def __init__(self, token, pool_size=10, limiter=None, max_retries=MAX_RETRIES):
+        self.tokens = token if hasattr(token, "renew") else None
+        self.session = get_session(None if self.tokens else token, pool_size)
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "requests": 0, "retries": 0, "throttled": 0, "errors": 0,
+            "request_seconds": 0.0, "throttled_seconds": 0.0,
+        }
+
+    def _count(self, **deltas):
+        with self._metrics_lock:
+            for key, value in deltas.items():
+                self.metrics[key] += value
+
+    def get(self, path, params=None):
+        return self._send(path, params).json()
+
+    def get_if_changed(self, path, etag=None):
+        """Conditional GET: ``(None, etag)`` on 304 Not Modified, else ``(body, new_etag)``."""
+        response = self._send(path, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            return None, etag
+        return response.json(), response.headers.get("ETag")
+
+    def _send(self, path, params=None, headers=None):
+        url = path if path.startswith("http") else f"{API_URL}{path}"
+        endpoint = endpoint_of(path)
+        renewed = False
+        for attempt in range(self.max_retries + 1):
+            self._count(throttled_seconds=self.limiter.acquire())
+            token = self.tokens.token() if self.tokens else None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT,
+                                            headers=dict(headers or {}, Authorization=token) if token else headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count(requests=1, errors=1, request_seconds=time.perf_counter() - start)
+                process_metrics.count("clickup_requests_total", endpoint=endpoint, status="error")
+                if attempt == self.max_retries:
+                    raise ClickUpAPIError(0, str(e), path) from e
+                self._backoff(attempt)
+                continue
+            elapsed = time.perf_counter() - start
+            self._count(requests=1, request_seconds=elapsed)
+            process_metrics.observe("clickup_request_seconds", elapsed, endpoint=endpoint)
+            process_metrics.count("clickup_requests_total", endpoint=endpoint, status=response.status_code)
+            self.limiter.update(response.headers)
+
+            if response.status_code in (200, 304):
+                return response
+            if response.status_code == 401 and self.tokens and not renewed and attempt < self.max_retries:
+                # Expired, or replaced by a refresh in another process
+                self.tokens.renew(rejected=token)
+                renewed = True
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                self._count(errors=1)
+                raise ClickUpAPIError(response.status_code, response.text, path)
+            if response.status_code == 429:
+                self._count(throttled=1)
+                self._wait_for_reset(response.headers, attempt)
+            else:
+                self._backoff(attempt)
+
+    def _backoff(self, attempt):
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        self._count(retries=1, throttled_seconds=delay)
+        time.sleep(delay)
+
+    def _wait_for_reset(self, headers, attempt):
+        # The next acquire() waits for the reset; a plain backoff covers
+        # servers that send neither X-RateLimit-Reset nor Retry-After.
+        reset = headers.get("X-RateLimit-Reset")
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            self.limiter.block_until(time.time() + float(retry_after))
+        elif reset:
+            self.limiter.block_until(float(reset))
+        else:
+            self._backoff(attempt)
+            return
+        self._count(retries=1)
+
+    def close(self):
+        self.session.close()
+
+
+def print_metrics(metrics):
+    print(f"\n🌐 {metrics['requests']} requêtes, {metrics['retries']} relances, "
+          f"{metrics['throttled']} réponses 429")
+    print(f"   utile    {metrics['request_seconds']:.2f}s")
+    print(f"   attente  {metrics['throttled_seconds']:.2f}s")
+    for endpoint, (count, total, slowest) in process_metrics.summary("clickup_request_seconds", "endpoint").items():
+        print(f"   {endpoint:<24} {count:>6} req  moy. {total / count * 1000:6.0f} ms  max {slowest * 1000:6.0f} ms")
@@ -0,0 +1,60 @@
+import os
+import json
+import time
+import threading
+
+from auth.oauth_handler import DATA_DIR
+from storage.atomic import atomic_path
+
+HIERARCHY_FILE = os.path.join(DATA_DIR, "hierarchy_cache.json")
+HIERARCHY_TTL = int(os.getenv("CLICKUP_HIERARCHY_TTL", "3600"))
+
+
+class HierarchyCache:
+    """Persistent cache of the team/space/folder/list endpoints.
+
+    Each endpoint answer is kept with the time it was fetched and its ETag.
+    Within ``ttl`` seconds it is served from disk without any request; after
+    that (or with ``refresh``) it is revalidated with If-None-Match when the
+    server gave an ETag, and re-downloaded otherwise. Task endpoints are never
+    cached here, so a sync only pays for the tasks themselves.
+    """
+
+    def __init__(self, path=HIERARCHY_FILE, ttl=HIERARCHY_TTL, refresh=False):
+        self.path = path
+        self.ttl = ttl
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except ValueError:
+            return {}
+
+    def fetch(self, client, path, key):
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and not self.refresh and time.time() - entry["fetched_at"] < self.ttl:
+            with self._lock:
+                self.hits += 1
+            return entry["items"]
+
+        body, etag = client.get_if_changed(path, entry.get("etag") if entry else None)
+        items = entry["items"] if body is None else body.get(key, [])
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = {"fetched_at": time.time(), "etag": etag, "items": items}
+        return items
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._entries)
+        with atomic_path(self.path) as tmp, open(tmp, "w") as f:
+            f.write(data)
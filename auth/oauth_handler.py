@@ -3,50 +3,164 @@
 import requests
 import json
 import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from storage.atomic import atomic_path
+
+load_dotenv()
+
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 REDIRECT_URI = os.getenv("REDIRECT_URI")
+TOKEN_URL = os.getenv("CLICKUP_TOKEN_URL", "https://api.clickup.com/api/v2/oauth/token")
+# Tokens are refreshed this many seconds before they expire
+REFRESH_MARGIN = int(os.getenv("CLICKUP_TOKEN_REFRESH_MARGIN", "300"))
+REQUEST_TIMEOUT = 30
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data")
+# Tokens, sync state and hierarchy cache; benchmarks point it at a scratch directory
+DATA_DIR = os.getenv("CLICKUP_DATA_DIR", os.path.join(BASE_DIR, "data"))
 os.makedirs(DATA_DIR, exist_ok=True)
 
 TOKEN_FILE = os.path.join(DATA_DIR, "clickup_tokens.json")
+# A refresh lock older than this is left over from a crashed process
+LOCK_STALE_SECONDS = 60
+
+
+class TokenError(Exception):
+    pass
+
+
+@contextmanager
+def token_lock(path):
+    """Let one process at a time refresh the token; the others wait for it."""
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE_SECONDS:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        os.remove(path)
+
+
+class TokenManager:
+    """The ClickUp access token, kept in memory and refreshed before it expires.
+
+    ``token`` costs a dict lookup until the token gets within
+    ``refresh_margin`` seconds of ``expires_at``. Then one thread renews it
+    while the others of the process wait on the lock and reuse the result.
+    Across processes (web workers, sync daemon, CLI), the token file is read
+    again first: another process may already have refreshed it. Otherwise
+    the refresh runs under a lock file. ``renew(rejected=token)`` handles a
+    token the API refused (HTTP 401). Nothing here prompts: without a token
+    file, ``token`` raises TokenError.
+    """
+
+    def __init__(self, path=TOKEN_FILE, refresh_margin=REFRESH_MARGIN):
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._tokens = None
+
+    def _usable(self, tokens, rejected=None):
+        if not tokens or tokens.get("access_token") in (None, rejected):
+            return False
+        expires_at = tokens.get("expires_at")
+        return not expires_at or expires_at - self.refresh_margin > time.time()
+
+    def token(self):
+        tokens = self._tokens
+        if self._usable(tokens):
+            return tokens["access_token"]
+        return self.renew()
+
+    def renew(self, rejected=None):
+        """Return a usable token, refreshing it at most once for all the threads waiting."""
+        with self._lock:
+            if self._usable(self._tokens, rejected):
+                return self._tokens["access_token"]
+            tokens = self._read()
+            if not self._usable(tokens, rejected):
+                with token_lock(self.path + ".lock"):
+                    tokens = self._read()
+                    if not self._usable(tokens, rejected):
+                        tokens = self._refresh(tokens)
+            self._tokens = tokens
+            return tokens["access_token"]
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _refresh(self, tokens):
+        if not tokens:
+            raise TokenError("Aucun token ClickUp : lancez python auth/oauth_handler.py <code OAuth2>")
+        if not tokens.get("refresh_token"):
+            raise TokenError("Token ClickUp expiré ou refusé, et aucun refresh_token pour le renouveler")
+        print("🔐 Renouvellement du token ClickUp")
+        return self._request({
+            "client_id": CLIENT_ID,
+            "client_secret": CLIENT_SECRET,
+            "refresh_token": tokens["refresh_token"]
+        }, tokens)
+
+    def exchange_code(self, code):
+        with self._lock, token_lock(self.path + ".lock"):
+            self._tokens = self._request({
+                "client_id": CLIENT_ID,
+                "client_secret": CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": REDIRECT_URI
+            })
+            return self._tokens["access_token"]
+
+    def _request(self, payload, previous=None):
+        res = requests.post(TOKEN_URL, data=payload, timeout=REQUEST_TIMEOUT).json()
+        if "access_token" not in res:
+            raise TokenError(f"Réponse OAuth2 sans access_token : {str(res)[:200]}")
+        if previous and "refresh_token" not in res and "refresh_token" in previous:
+            res["refresh_token"] = previous["refresh_token"]
+        if res.get("expires_in"):
+            res["expires_at"] = time.time() + float(res["expires_in"])
+        with atomic_path(self.path) as tmp, open(tmp, "w") as f:
+            json.dump(res, f)
+        return res
+
+
+# Shared by every client of the process
+token_manager = TokenManager()
+
 
 def get_access_token():
-    if not os.path.exists(TOKEN_FILE):
-        code = input("🔐 Entrez le code OAuth2 : ")
-        return exchange_code_for_token(code)
-    else:
-        with open(TOKEN_FILE) as f:
-            tokens = json.load(f)
-        return tokens["access_token"]
+    return token_manager.token()
+
 
 def exchange_code_for_token(code):
-    url = "https://api.clickup.com/api/v2/oauth/token"
-    payload = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET,
-        "code": code,
-        "redirect_uri": REDIRECT_URI
-    }
-    res = requests.post(url, data=payload).json()
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(res, f)
-    return res["access_token"]
+    return token_manager.exchange_code(code)
+
 
 def refresh_token():
-    with open(TOKEN_FILE) as f:
-        tokens = json.load(f)
-    url = "https://api.clickup.com/api/v2/oauth/token"
-    payload = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET,
-        "refresh_token": tokens["refresh_token"]
-    }
-    res = requests.post(url, data=payload).json()
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(res, f)
-    return res["access_token"]
+    return token_manager.renew(rejected=token_manager.token())
+
+
+if __name__ == "__main__":
+    code = sys.argv[1] if len(sys.argv) > 1 else input("🔐 Entrez le code OAuth2 : ")
+    exchange_code_for_token(code)
+    print(f"✅ Token enregistré dans {TOKEN_FILE}")
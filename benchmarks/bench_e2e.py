@@ -0,0 +1,179 @@
+import sys
+import os
+import json
+import time
+import base64
+import argparse
+import platform
+import tempfile
+import subprocess
+import datetime as dt
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+from benchmarks.fake_clickup import FakeClickUp
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline_e2e.json")
+VIEWS = ["detailed", "task", "Project 📁 "]
+# A step is a regression when it is this much slower than the baseline, and by more than MIN_DELTA seconds
+TOLERANCE = 0.3
+MIN_DELTA = 0.05
+
+
+def _best(func, repeat, before=None):
+    seconds = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def _post_update_graph(client, headers, view_mode):
+    dependencies = client.get("/_dash-dependencies", headers=headers).get_json()
+    graph = next(d for d in dependencies if "timeline-graph.figure" in d["output"])
+    values = {"granularity": "monthly", "view-mode": view_mode, "row-page": 1}
+    props = lambda items: [dict(item, value=values.get(item["id"])) for item in items]
+    outputs = [dict(zip(["id", "property"], output.split("."))) for output in graph["output"].strip(".").split("...")]
+    response = client.post("/_dash-update-component", headers=headers, json={
+        "output": graph["output"], "outputs": outputs, "inputs": props(graph["inputs"]),
+        "state": props(graph["state"]), "changedPropIds": ["view-mode.value"],
+    })
+    if response.status_code != 200:
+        raise RuntimeError(f"update_graph → HTTP {response.status_code}")
+
+
+def run_steps(repeat):
+    """Time each stage of the sync and render path. Runs in the child, inside the scratch directory."""
+    from tasks.get_all_tasks_with_subtasks import get_all_tasks_with_subtasks
+    from storage.task_store import save_tasks
+    from timeline import view
+    from timeline.rows import build_timeline_data
+    import timeline_app
+
+    results, counters = {}, {}
+    metrics = {}
+    crawled = []
+    results["get_all_tasks_with_subtasks"] = _best(
+        lambda: crawled.append(get_all_tasks_with_subtasks(metrics=metrics)), repeat)
+    df = crawled[-1]
+    counters.update(tasks=len(df), requests=metrics.get("requests", 0), throttled=metrics.get("throttled", 0))
+    save_tasks(df)
+
+    results["load_data"] = _best(view.load_data, repeat, before=view.dataset_cache.invalidate)
+    df = view.load_data()
+    for view_mode in VIEWS:
+        results[f"build_timeline_data[{view_mode.strip()}]"] = _best(lambda: build_timeline_data(df, view_mode), repeat)
+
+    client = timeline_app.create_app().server.test_client()
+    headers = {"Authorization": "Basic " + base64.b64encode(b"bench:bench").decode()}
+    for view_mode in VIEWS:
+        # Built each time, not served from the figure cache
+        results[f"update_graph[{view_mode.strip()}]"] = _best(
+            lambda: _post_update_graph(client, headers, view_mode), repeat, before=view.figure_cache.clear)
+    return {"results": {step: round(seconds, 4) for step, seconds in results.items()}, "counters": counters}
+
+
+def run_suite(scenario, repeat):
+    with tempfile.TemporaryDirectory() as tmp, FakeClickUp(**scenario) as fake:
+        with open(os.path.join(tmp, "clickup_tokens.json"), "w") as f:
+            json.dump({"access_token": "bench"}, f)
+        env = dict(
+            os.environ, PYTHONPATH=ROOT, CLICKUP_API_URL=fake.url, CLICKUP_DATA_DIR=tmp,
+            CLICKUP_HIERARCHY_TTL="0", DASH_USERNAME="bench", DASH_PASSWORD="bench",
+            # Until the fake server sends its X-RateLimit-* headers
+            CLICKUP_RATE_LIMIT=str(scenario.get("rate_limit") or 1_000_000),
+        )
+        # A fresh interpreter, working in the scratch directory like a deployed worker in its own
+        out = subprocess.run([sys.executable, __file__, "--child", str(repeat)], cwd=tmp, env=env,
+                             capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr)
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+    return {
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scenario": scenario,
+        "repeat": repeat,
+        **run,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    """One row per step of ``current``, flagged when slower than ``baseline`` beyond the tolerance."""
+    rows = []
+    for step, seconds in current["results"].items():
+        before = baseline["results"].get(step) if baseline else None
+        regression = before is not None and seconds > before * (1 + tolerance) and seconds - before > min_delta
+        rows.append({
+            "step": step, "baseline_s": before, "current_s": seconds,
+            "ratio": round(seconds / before, 2) if before else None,
+            "": "⚠️ régression" if regression else "",
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        print(json.dumps(run_steps(int(sys.argv[2]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark de bout en bout : synchro ClickUp simulée puis rendu")
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--teams", type=int, default=2)
+    parser.add_argument("--spaces", type=int, default=2, help="espaces par équipe")
+    parser.add_argument("--folders", type=int, default=3, help="dossiers par espace")
+    parser.add_argument("--lists", type=int, default=48)
+    parser.add_argument("--folderless", type=int, default=1, help="listes hors dossier par espace")
+    parser.add_argument("--latency", type=float, default=0.02, help="secondes ajoutées à chaque réponse")
+    parser.add_argument("--rate-limit", type=int, default=200, help="requêtes par fenêtre, 0 pour aucune limite")
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="enregistrer ces résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    scenario = {
+        "tasks": args.tasks, "teams": args.teams, "spaces": args.spaces, "folders": args.folders,
+        "lists": args.lists, "folderless": args.folderless, "latency": args.latency,
+        "rate_limit": args.rate_limit or None, "rate_window": args.rate_window,
+    }
+    current = run_suite(scenario, args.repeat)
+    print(f"🧪 {current['counters']['tasks']} tâches, {current['counters']['requests']} requêtes, "
+          f"{current['counters']['throttled']} réponses 429")
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["scenario"] != scenario:
+            print("⚠️ Scénario différent de la référence : comparaison indicative")
+    table = compare(current, baseline, args.tolerance)
+    print(table.to_string(index=False))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"📁 Résultats : {args.output}")
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"📁 Référence enregistrée : {args.baseline}")
+    elif table[""].astype(bool).any():
+        print(f"❌ Régression au-delà de {args.tolerance:.0%} par rapport à {args.baseline}")
+        sys.exit(1)
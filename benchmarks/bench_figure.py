@@ -0,0 +1,57 @@
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import pandas as pd
+import plotly.io as pio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from storage.task_store import save_tasks
+
+VIEWS = ["detailed", "task", "Project 📁 "]
+
+
+def bench(n, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        # The dashboard reads the task store of the working directory
+        os.chdir(tmp)
+        save_tasks(make_tasks(n))
+        from timeline import view as ta
+        from dash import Patch
+        from timeline.figure import xaxis_ticks
+
+        version, df = ta.load_snapshot()
+        results = []
+        for view_mode in VIEWS:
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fig = ta.build_figure(df, version, "monthly", view_mode, None, None, None)[0]
+                seconds.append(time.perf_counter() - start)
+            results.append({
+                "view": view_mode, "update": "figure", "bars": sum(len(trace.y) for trace in fig.data),
+                "build_s": round(min(seconds), 3), "payload_kb": round(len(pio.to_json(fig)) / 1024, 1),
+            })
+
+        # What update_graph sends when only the granularity changes
+        start = time.perf_counter()
+        patch = Patch()
+        for name, value in xaxis_ticks(ta.get_time_settings("weekly")).items():
+            patch["layout"]["xaxis"][name] = value
+        results.append({
+            "view": "detailed", "update": "granularity", "bars": 0,
+            "build_s": round(time.perf_counter() - start, 3),
+            "payload_kb": round(len(json.dumps(patch.to_plotly_json())) / 1024, 1),
+        })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de construction et taille des figures de la timeline")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(bench(args.tasks, args.repeat).to_string(index=False))
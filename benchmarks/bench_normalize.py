@@ -0,0 +1,70 @@
+import sys
+import os
+import time
+import argparse
+from datetime import datetime
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fake_clickup import PAGE_SIZE, make_task
+from storage.task_store import to_typed
+from tasks.get_all_tasks_with_subtasks import normalize_pages
+
+
+def task_to_row(task, team_name, space_name, folder_name, list_name):
+    # The per-task formatting the crawl did before, kept as the reference
+    created_date = int(task["date_created"]) / 1000 if task.get("date_created") else None
+    start_date = int(task["start_date"]) / 1000 if task.get("start_date") else None
+    due_date = int(task["due_date"]) / 1000 if task.get("due_date") else None
+    priority = task.get("priority")
+    # The first assignee string was built, then overwritten
+    ", ".join([a["username"] if a.get("username") else a.get("email", "Inconnu") for a in task.get("assignees", [])])
+    return {
+        "type": "subtask" if task.get("parent") else "task",
+        "task_id": task["id"],
+        "parent_id": task["parent"] if task.get("parent") else task["id"],
+        "task_name": task["name"],
+        "status": task["status"]["status"],
+        "assignee": ", ".join([
+            (a.get("username") or a.get("email", "Inconnu")).split("@")[0] for a in task.get("assignees", [])
+        ]) or "Non assignée",
+        "priority": priority["priority"] if priority and isinstance(priority, dict) else "Non précisée",
+        "created_date": datetime.fromtimestamp(created_date).strftime("%Y-%m-%d %H:%M") if created_date else None,
+        "start_date": datetime.fromtimestamp(start_date).strftime("%Y-%m-%d") if start_date else None,
+        "due_date": datetime.fromtimestamp(due_date).strftime("%Y-%m-%d") if due_date else None,
+        "list": list_name, "folder": folder_name, "space": space_name, "team": team_name,
+    }
+
+
+def per_task(pages):
+    return to_typed(pd.DataFrame([task_to_row(task, *location[:3], location[3]["name"])
+                                  for location, tasks in pages for task in tasks]))
+
+
+def batch(pages):
+    return to_typed(pd.concat(list(normalize_pages(pages)), ignore_index=True))
+
+
+def bench(n, repeat):
+    tasks = [make_task("L0", i) for i in range(n)]
+    location = ("Team", "Space", "Folder", {"id": "L0", "name": "List"})
+    pages = [(location, tasks[i:i + PAGE_SIZE]) for i in range(0, n, PAGE_SIZE)]
+    results = []
+    frames = {}
+    for name, func in [("par tâche", per_task), ("par lot", batch)]:
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            frames[name] = func(pages)
+            seconds.append(time.perf_counter() - start)
+        results.append({"normalizer": name, "tasks": n, "ms_per_10k": round(min(seconds) / n * 10_000 * 1000, 1)})
+    pd.testing.assert_frame_equal(frames["par tâche"], frames["par lot"])
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coût de la normalisation des tâches brutes de l'API")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(bench(args.tasks, args.repeat).to_string(index=False))
@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import STATUSES, make_tasks
+from storage.rollups import build_rollups, summary, update_rollups
+from storage.task_model import timeline_tasks
+from timeline.rows import SUMMARY_VIEWS, build_timeline_data
+
+
+def _best(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds) * 1000
+
+
+def bench(n, changed, repeat, seed=0):
+    store = make_tasks(n, seed=seed)
+    df = timeline_tasks(store)
+    rollups = build_rollups(store)
+    results = []
+    for view_mode, level in SUMMARY_VIEWS.items():
+        groups = summary(rollups, level)
+        results.append({
+            "tasks": n, "step": f"rows[{view_mode.strip()}]",
+            "scan_ms": round(_best(lambda: build_timeline_data(df, view_mode), repeat), 1),
+            "rollups_ms": round(_best(lambda: build_timeline_data(df, view_mode, groups=groups), repeat), 1),
+            "groups": len(groups),
+        })
+
+    # A sync bringing a few updated tasks: their status changes
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(n, changed, replace=False)
+    updated = store.copy()
+    updated.loc[rows, "status"] = rng.choice(STATUSES, changed)
+    ids = set(updated.loc[rows, "task_id"])
+    pd.testing.assert_frame_equal(update_rollups(rollups, store, updated, ids), build_rollups(updated))
+    results.append({
+        "tasks": n, "step": f"sync {changed} tâches",
+        "scan_ms": round(_best(lambda: build_rollups(updated), repeat), 1),
+        "rollups_ms": round(_best(lambda: update_rollups(rollups, store, updated, ids), repeat), 1),
+        "groups": len(rollups),
+    })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vues résumées : parcours des tâches contre index de cumuls")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--changed", type=int, default=20, help="tâches modifiées par la synchro simulée")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [row for n in args.tasks for row in bench(n, args.changed, args.repeat)]
+    print(pd.DataFrame(results).to_string(index=False))
@@ -0,0 +1,73 @@
+import sys
+import os
+import argparse
+import tempfile
+import multiprocessing as mp
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from storage.shared_dataset import map_dataset, publish_dataset
+from storage.task_model import timeline_tasks
+from storage.task_store import load_tasks, save_tasks
+
+
+def proportional_mb():
+    # PSS splits shared pages between the processes mapping them, so the sum over workers is the real cost
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker(mode, store, shared, ready, done, results):
+    if mode == "copy":
+        df = timeline_tasks(load_tasks(path=store))
+    elif mode == "mmap":
+        df = map_dataset(shared)
+    else:
+        df = pd.DataFrame()
+    # Read every column once, as the first figure of a worker would
+    for column in df:
+        df[column].str.len().sum() if df[column].dtype == "str" else df[column].count()
+    ready.wait()
+    results.put(proportional_mb())
+    done.wait()
+
+
+def run(mode, workers, store, shared):
+    ctx = mp.get_context("spawn")
+    ready, done, results = ctx.Barrier(workers), ctx.Barrier(workers + 1), ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, store, shared, ready, done, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    total = sum(results.get() for _ in processes)
+    done.wait()
+    for process in processes:
+        process.join()
+    return total
+
+
+def bench(n, worker_counts):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = save_tasks(make_tasks(n), path=os.path.join(tmp, "tasks.parquet"))
+        shared = publish_dataset(load_tasks(path=store), path=os.path.join(tmp, "tasks.arrow"))
+        for workers in worker_counts:
+            # Workers without any data give the interpreter and library baseline
+            baseline = run("none", workers, store, shared)
+            for mode in ["copy", "mmap"]:
+                results.append({
+                    "workers": workers, "mode": mode,
+                    "dataset_mb": round(run(mode, workers, store, shared) - baseline, 1),
+                })
+    return pd.DataFrame(results).pivot(index="workers", columns="mode", values="dataset_mb")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mémoire du jeu de données selon le nombre de workers Dash")
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    print(bench(args.tasks, args.workers).to_string())
@@ -0,0 +1,77 @@
+import sys
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+from benchmarks.synthetic import make_tasks
+from storage.task_store import save_tasks, store_path
+
+# Runs in a fresh interpreter: boot a worker, then serve the page and the first figure
+CHILD = """
+import base64, json, time
+start = time.perf_counter()
+import timeline_app
+app = timeline_app.create_app() if hasattr(timeline_app, "create_app") else timeline_app.app
+server = app.server
+boot = time.perf_counter()
+client = server.test_client()
+headers = {"Authorization": "Basic " + base64.b64encode(b"bench:bench").decode()}
+client.get("/", headers=headers)
+client.get("/_dash-layout", headers=headers)
+page = time.perf_counter()
+values = {"granularity": "monthly", "view-mode": "detailed", "row-page": 1}
+dependencies = client.get("/_dash-dependencies", headers=headers).get_json()
+graph = next(d for d in dependencies if "timeline-graph.figure" in d["output"])
+props = lambda items: [dict(item, value=values.get(item["id"])) for item in items]
+outputs = [dict(zip(["id", "property"], output.split("."))) for output in graph["output"].strip(".").split("...")]
+response = client.post("/_dash-update-component", headers=headers, json={
+    "output": graph["output"], "outputs": outputs, "inputs": props(graph["inputs"]),
+    "state": props(graph["state"]), "changedPropIds": [],
+})
+figure = time.perf_counter()
+print(json.dumps({"boot_s": boot - start, "first_page_s": page - boot, "first_figure_s": figure - page,
+                  "status": response.status_code}))
+"""
+
+
+def run_worker(root, cwd):
+    env = dict(os.environ, PYTHONPATH=root, DASH_USERNAME="bench", DASH_PASSWORD="bench")
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode:
+        return {"boot_s": None, "first_page_s": None, "first_figure_s": None,
+                "status": result.stderr.strip().splitlines()[-1][:60]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(n, roots, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # The dashboard reads the task store of the working directory
+        with_data = os.path.join(tmp, "data")
+        missing = os.path.join(tmp, "missing")
+        os.makedirs(with_data)
+        os.makedirs(missing)
+        save_tasks(make_tasks(n), path=os.path.join(with_data, store_path()))
+        for root in roots:
+            for dataset, cwd in [(f"{n} tâches", with_data), ("fichier absent", missing)]:
+                runs = [run_worker(root, cwd) for _ in range(repeat)]
+                best = min(runs, key=lambda r: r["boot_s"] if r["boot_s"] is not None else float("inf"))
+                results.append({"tree": root, "dataset": dataset, **{
+                    key: round(value, 3) if isinstance(value, float) else value for key, value in best.items()
+                }})
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de démarrage d'un worker du dashboard")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    # Other checkouts to compare, e.g. a git worktree of an older commit
+    parser.add_argument("--roots", nargs="+", default=[ROOT])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(bench(args.tasks, args.roots, args.repeat).to_string(index=False))
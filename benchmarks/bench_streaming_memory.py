@@ -0,0 +1,77 @@
+import sys
+import os
+import json
+import argparse
+import resource
+import subprocess
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fake_clickup import FakeClickUp
+
+TASKS_PER_LIST = 5_000
+
+
+def crawl(mode, url, tmp, max_memory):
+    """Run in a child process: crawl the fake server, write the store, return the peak RSS."""
+    os.environ["CLICKUP_API_URL"] = url
+    from concurrent.futures import ThreadPoolExecutor
+    from api.client import ClickUpClient, RateLimiter
+    from api.hierarchy import HierarchyCache
+    from storage.task_store import save_tasks
+    from tasks.crawler import DEFAULT_CONCURRENCY, crawl_lists
+    from tasks.pagination import iter_pages
+    from tasks.get_all_tasks_with_subtasks import TASK_PARAMS, normalize_pages, stream_all_tasks_with_subtasks
+
+    # The fake server has no rate limit
+    client = ClickUpClient("bench", limiter=RateLimiter(limit=1_000_000))
+    hierarchy = HierarchyCache(path=os.path.join(tmp, "hierarchy.json"), ttl=0)
+    path = os.path.join(tmp, f"tasks_{mode}.parquet")
+    if mode == "stream":
+        _, rows = stream_all_tasks_with_subtasks(path=path, fmt="parquet", max_memory=max_memory,
+                                                 client=client, hierarchy=hierarchy)
+    else:
+        # What the script did before streaming: every row in memory, then one DataFrame
+        with ThreadPoolExecutor(max_workers=DEFAULT_CONCURRENCY) as pool:
+            lists = crawl_lists(client, pool, {}, hierarchy)
+        pages = iter_pages(client, lists, lambda list_id: TASK_PARAMS, DEFAULT_CONCURRENCY, ordered=True)
+        all_tasks = pd.concat(list(normalize_pages(pages)), ignore_index=True)
+        save_tasks(all_tasks, fmt="parquet", path=path)
+        rows = len(all_tasks)
+    return {"rows": rows, "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+
+
+def bench(sizes, modes, max_memory):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            with FakeClickUp(n, lists=max(1, n // TASKS_PER_LIST)) as fake:
+                for mode in modes:
+                    # A fresh interpreter per run, so ru_maxrss is the peak of that run only
+                    out = subprocess.run(
+                        [sys.executable, __file__, "--child", mode, fake.url, tmp, str(max_memory)],
+                        capture_output=True, text=True, check=True,
+                    )
+                    results.append({"tasks": n, "mode": mode, **json.loads(out.stdout.splitlines()[-1])})
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        mode, url, tmp, max_memory = sys.argv[2:6]
+        print(json.dumps(crawl(mode, url, tmp, int(max_memory))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Pic de mémoire de la récupération des tâches")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 100_000, 300_000])
+    parser.add_argument("--modes", nargs="+", default=["stream", "buffered"], choices=["stream", "buffered"])
+    parser.add_argument("--max-memory", type=int, default=256, help="budget en Mo du mode stream")
+    args = parser.parse_args()
+
+    df = bench(args.sizes, args.modes, args.max_memory)
+    print(df.to_string(index=False))
+    stream = df[df["mode"] == "stream"]["peak_rss_mb"]
+    if len(stream) > 1:
+        growth = stream.max() - stream.min()
+        print(f"\n{'✅' if growth < 0.2 * stream.min() else '❌'} mode stream : pic de {stream.min()} à {stream.max()} Mo")
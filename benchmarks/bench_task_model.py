@@ -0,0 +1,33 @@
+import sys
+import os
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from storage.task_model import assignee_table, compact_tasks
+from storage.task_store import load_tasks, save_tasks
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True, index=False) / 1e6
+
+
+def bench(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Measure the table as the app reads it from the store, not as generated
+        path = save_tasks(make_tasks(n), path=os.path.join(tmp, "tasks.parquet"))
+        df = load_tasks(path=path)
+    compact = compact_tasks(df)
+    table = pd.DataFrame({"before_mb": megabytes(df), "after_mb": megabytes(compact)})
+    table.loc["task↔assignee"] = [0.0, megabytes(assignee_table(compact["assignee"])).sum()]
+    table.loc["total"] = table.sum()
+    return (table * 100_000 / n).round(2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mémoire du modèle de tâches, par tranche de 100k tâches")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+    print(bench(args.tasks).to_string())
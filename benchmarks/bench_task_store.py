@@ -0,0 +1,47 @@
+import sys
+import os
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from storage.task_store import BACKENDS, load_tasks, save_tasks
+
+
+def bench(sizes, formats, excel_max, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            df = make_tasks(n)
+            for fmt in formats:
+                if fmt == "excel" and n > excel_max:
+                    continue
+                path = os.path.join(tmp, f"tasks_{n}{BACKENDS[fmt][0]}")
+                start = time.perf_counter()
+                save_tasks(df, fmt=fmt, path=path)
+                write_s = time.perf_counter() - start
+                load_s = min(_timed(load_tasks, fmt, path) for _ in range(repeat))
+                results.append({
+                    "rows": n, "format": fmt, "write_s": round(write_s, 3),
+                    "load_s": round(load_s, 3), "size_mb": round(os.path.getsize(path) / 1e6, 1),
+                })
+    return pd.DataFrame(results)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de chargement du stockage des tâches")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    # openpyxl needs minutes per million rows; skip Excel above this size
+    parser.add_argument("--excel-max", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(bench(args.sizes, args.formats, args.excel_max, args.repeat).to_string(index=False))
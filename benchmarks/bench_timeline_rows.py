@@ -0,0 +1,27 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from timeline.rows import build_timeline_data
+
+VIEW_MODES = ["detailed", "task", "Project 📁 "]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de build_timeline_data sur un jeu synthétique")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_tasks(args.tasks)
+    print(f"📊 {len(df)} tâches, {df['list'].nunique()} listes")
+    for mode in VIEW_MODES:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rows = build_timeline_data(df, mode)
+            best = min(best, time.perf_counter() - start)
+        print(f"   {mode:<12} {len(rows):>7} lignes  {best * 1000:8.1f} ms")
@@ -0,0 +1,201 @@
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 100
+STATUSES = ["to do", "in progress", "review", "done", "complete"]
+PRIORITIES = [None, {"priority": "urgent"}, {"priority": "high"}, {"priority": "normal"}, {"priority": "low"}]
+PEOPLE = ["alice.martin", "Bob Ross", "Chloé Dupont", "David Nguyen", "Emma Leroy"]
+DAY_MS = 86_400_000
+EPOCH_MS = 1_704_067_200_000  # 2024-01-01
+
+
+def make_task(list_id, i):
+    """Task ``i`` of a list, as the ClickUp API returns it. Every third task is a subtask."""
+    created = EPOCH_MS + (i % 365) * DAY_MS
+    return {
+        "id": f"{list_id}t{i}",
+        "name": f"Tâche synthétique {i} de {list_id}",
+        "status": {"status": STATUSES[i % len(STATUSES)]},
+        "parent": f"{list_id}t{i - 1}" if i % 3 == 2 else None,
+        "priority": PRIORITIES[i % len(PRIORITIES)],
+        "assignees": [{"username": PEOPLE[i % len(PEOPLE)]}] if i % 4 else [],
+        "date_created": str(created),
+        "date_updated": str(created + DAY_MS),
+        "start_date": str(created + 7 * DAY_MS),
+        "due_date": str(created + (7 + i % 30) * DAY_MS),
+    }
+
+
+class FakeClickUp:
+    """In-process stand-in for the ClickUp API, serving a synthetic workspace.
+
+    ``teams`` teams hold ``spaces`` spaces each, and every space holds
+    ``folders`` folders and ``folderless`` lists outside any folder. ``lists``
+    lists are spread over the folders of the whole workspace, and ``tasks``
+    tasks evenly over every list. Pages are generated on request, so the
+    server itself needs no memory for a large workspace. ``latency`` seconds
+    are added to every response. With ``rate_limit``, at most that many
+    requests are served per ``rate_window`` seconds: responses carry the
+    X-RateLimit-* headers of ClickUp and the extra requests get a 429.
+    """
+
+    def __init__(self, tasks, lists=10, folders=2, latency=0.0, port=0, teams=1, spaces=1, folderless=0,
+                 rate_limit=None, rate_window=60.0):
+        self.tasks = tasks
+        self.lists = lists
+        self.folders = folders
+        self.teams = teams
+        self.spaces = spaces
+        self.folderless = folderless
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.requests = 0
+        self.throttled = 0
+        self._window = (0.0, 0)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/api/v2"
+
+    @property
+    def total_lists(self):
+        return self.lists + self.teams * self.spaces * self.folderless
+
+    def list_size(self, position):
+        return self.tasks // self.total_lists + (1 if position < self.tasks % self.total_lists else 0)
+
+    def rate_headers(self):
+        """Count a request against the window; ``(allowed, headers)``."""
+        if not self.rate_limit:
+            return True, {}
+        with self._lock:
+            now = time.time()
+            started, used = self._window
+            if now >= started + self.rate_window:
+                started, used = now, 0
+            allowed = used < self.rate_limit
+            used += allowed
+            self._window = (started, used)
+            if not allowed:
+                self.throttled += 1
+        return allowed, {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.rate_limit - used),
+            "X-RateLimit-Reset": f"{started + self.rate_window:.3f}",
+        }
+
+    def route(self, path, query):
+        n_folders = self.teams * self.spaces * self.folders
+        if path == "/team":
+            return {"teams": [{"id": f"T{t}", "name": f"Équipe synthétique {t}"} for t in range(self.teams)]}
+        match = re.fullmatch(r"/team/T(\d+)/space", path)
+        if match:
+            first = int(match[1]) * self.spaces
+            return {"spaces": [{"id": f"S{k}", "name": f"Espace synthétique {k}"}
+                               for k in range(first, first + self.spaces)]}
+        match = re.fullmatch(r"/space/S(\d+)/folder", path)
+        if match:
+            first = int(match[1]) * self.folders
+            return {"folders": [{"id": f"F{k}", "name": f"Dossier {k}"} for k in range(first, first + self.folders)]}
+        match = re.fullmatch(r"/space/S(\d+)/list", path)
+        if match:
+            first = self.lists + int(match[1]) * self.folderless
+            return {"lists": [{"id": f"L{k}", "name": f"Projet {k}"} for k in range(first, first + self.folderless)]}
+        match = re.fullmatch(r"/folder/F(\d+)/list", path)
+        if match:
+            folder = int(match[1])
+            return {"lists": [
+                {"id": f"L{k}", "name": f"Projet {k}"} for k in range(folder, self.lists, n_folders)
+            ]}
+        match = re.fullmatch(r"/list/L(\d+)/task", path)
+        if match:
+            size = self.list_size(int(match[1]))
+            page = int(query.get("page", ["0"])[0])
+            first = page * PAGE_SIZE
+            indexes = range(first, min(first + PAGE_SIZE, size))
+            return {"tasks": [make_task(f"L{match[1]}", i) for i in indexes], "last_page": first + PAGE_SIZE >= size}
+        return None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                allowed, headers = fake.rate_headers()
+                url = urlparse(self.path)
+                body = fake.route(url.path.replace("/api/v2", "", 1), parse_qs(url.query)) if allowed else None
+                if not allowed:
+                    payload, status = b'{"err": "Rate limit reached", "ECODE": "APP_002"}', 429
+                elif body is None:
+                    payload, status = b"{}", 404
+                else:
+                    payload, status = json.dumps(body).encode(), 200
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Faux serveur ClickUp pour les benchmarks")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--teams", type=int, default=1)
+    parser.add_argument("--spaces", type=int, default=1, help="espaces par équipe")
+    parser.add_argument("--folders", type=int, default=2, help="dossiers par espace")
+    parser.add_argument("--lists", type=int, default=10, help="listes réparties sur tous les dossiers")
+    parser.add_argument("--folderless", type=int, default=0, help="listes hors dossier par espace")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, help="requêtes servies par fenêtre, 429 au-delà")
+    parser.add_argument("--rate-window", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeClickUp(args.tasks, args.lists, args.folders, args.latency, args.port, args.teams, args.spaces,
+                       args.folderless, args.rate_limit, args.rate_window)
+    print(f"🧪 Faux ClickUp sur {fake.url} ({args.tasks} tâches, {fake.total_lists} listes)")
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        pass
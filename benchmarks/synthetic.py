@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+STATUSES = ["to do", "selected for development", "in progress", "on hold", "review", "done", "complete"]
+PRIORITIES = ["urgent", "high", "normal", "low", "Non précisée"]
+PEOPLE = ["alice.martin", "Bob Ross", "Chloé Dupont", "David Nguyen", "Emma Leroy", "Farid Haddad", "Non assignée"]
+
+
+def make_tasks(n, n_lists=None, subtask_ratio=0.4, seed=0):
+    """Synthetic task table with the same columns and dtypes as the task store."""
+    rng = np.random.default_rng(seed)
+    n_lists = n_lists or max(1, n // 200)
+    ids = np.array([f"t{i:08d}" for i in range(n)], dtype=object)
+    list_idx = rng.integers(0, n_lists, n)
+
+    # A subtask points at the closest earlier task of the same list
+    is_subtask = rng.random(n) < subtask_ratio
+    is_subtask[0] = False
+    parent = ids.copy()
+    last_task = {}
+    for i in range(n):
+        lst = list_idx[i]
+        if is_subtask[i] and lst in last_task:
+            parent[i] = ids[last_task[lst]]
+        else:
+            is_subtask[i] = False
+            last_task[lst] = i
+
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+    assignee = [
+        ", ".join(rng.choice(PEOPLE[:-1], size=k, replace=False)) if k else PEOPLE[-1]
+        for k in rng.integers(0, 3, n)
+    ]
+    return pd.DataFrame({
+        "type": np.where(is_subtask, "subtask", "task"),
+        "task_id": pd.array(ids, dtype="string"),
+        "parent_id": pd.array(parent, dtype="string"),
+        "task_name": [f"Tâche synthétique numéro {i}" for i in range(n)],
+        "status": rng.choice(STATUSES, n),
+        "assignee": assignee,
+        "priority": rng.choice(PRIORITIES, n),
+        "created_date": start - pd.Timedelta(days=7),
+        "start_date": start,
+        "due_date": start + pd.to_timedelta(rng.integers(1, 60, n), unit="D"),
+        "list": [f"Projet {i}" for i in list_idx],
+        "folder": [f"Dossier {i % 7}" for i in list_idx],
+        "space": [f"Espace {i % 3}" for i in list_idx],
+        "team": "Dusens Research",
+    })
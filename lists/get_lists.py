@@ -1,50 +1,33 @@
 import sys
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from auth.oauth_handler import get_access_token
-
-def get_all_lists():
-    token = get_access_token()
-    headers = {"Authorization": token}
-
-    teams_url = "https://api.clickup.com/api/v2/team"
-    teams_response = requests.get(teams_url, headers=headers)
-    if teams_response.status_code != 200:
-        print(f"❌ Erreur team : {teams_response.text}")
+from auth.oauth_handler import token_manager
+from api.client import ClickUpAPIError, ClickUpClient
+from tasks.crawler import DEFAULT_CONCURRENCY, crawl_lists
+
+def get_all_lists(concurrency=DEFAULT_CONCURRENCY):
+    client = ClickUpClient(token_manager, pool_size=concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            lists = crawl_lists(client, pool, {})
+    except ClickUpAPIError as e:
+        print(f"❌ Erreur {e.path} : {e.text}")
         return []
+    finally:
+        client.close()
 
     lists_data = []
-
-    for team in teams_response.json().get("teams", []):
-        team_id = team["id"]
-        team_name = team["name"]
-
-        spaces_url = f"https://api.clickup.com/api/v2/team/{team_id}/space"
-        spaces_response = requests.get(spaces_url, headers=headers)
-        for space in spaces_response.json().get("spaces", []):
-            space_id = space["id"]
-            space_name = space["name"]
-
-            folders_url = f"https://api.clickup.com/api/v2/space/{space_id}/folder"
-            folders_response = requests.get(folders_url, headers=headers)
-            for folder in folders_response.json().get("folders", []):
-                folder_id = folder["id"]
-                folder_name = folder["name"]
-
-                lists_url = f"https://api.clickup.com/api/v2/folder/{folder_id}/list"
-                lists_response = requests.get(lists_url, headers=headers)
-                for lst in lists_response.json().get("lists", []):
-                    lists_data.append({
-                        "team": team_name,
-                        "space": space_name,
-                        "folder": folder_name,
-                        "list_id": lst["id"],
-                        "list_name": lst["name"]
-                    })
-
+    for team_name, space_name, folder_name, lst in lists:
+        lists_data.append({
+            "team": team_name,
+            "space": space_name,
+            "folder": folder_name,
+            "list_id": lst["id"],
+            "list_name": lst["name"]
+        })
     return lists_data
 
 
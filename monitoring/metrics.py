@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import time
+import logging
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# One JSON line per request on the "timeline.trace" logger
+TRACE = os.getenv("TIMELINE_TRACE", "0") == "1"
+# cProfile stats of the slowest callbacks are kept there, when set
+PROFILE_DIR = os.getenv("TIMELINE_PROFILE_DIR")
+PROFILE_KEEP = int(os.getenv("TIMELINE_PROFILE_KEEP", "10"))
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Since Python 3.12 a process can run only one cProfile at a time
+_profiling = threading.Lock()
+
+trace_logger = logging.getLogger("timeline.trace")
+if TRACE and not trace_logger.handlers:
+    trace_logger.addHandler(logging.StreamHandler())
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.propagate = False
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escape = lambda value: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+
+class Metrics:
+    """Counters and latency histograms of one process, rendered in the Prometheus text format.
+
+    Each Dash worker process has its own: Prometheus scrapes them one by one.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        # (name, labels) -> [count per bucket..., count, sum, max]
+        self._histograms = {}
+
+    def count(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            values = self._histograms.setdefault(key, [0] * len(self.buckets) + [0, 0.0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    values[i] += 1
+            values[-3] += 1
+            values[-2] += seconds
+            values[-1] = max(values[-1], seconds)
+
+    def summary(self, name, label):
+        """``{value of label: (count, total_seconds, max_seconds)}`` of one histogram."""
+        with self._lock:
+            return {dict(labels).get(label): tuple(values[-3:])
+                    for (key, labels), values in sorted(self._histograms.items()) if key == name}
+
+    def render(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(values)) for key, values in self._histograms.items())
+        lines = []
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (name, labels), values in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', str(bound))])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {values[-3]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {values[-3]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+metrics = Metrics()
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(stage):
+    """Time one stage of the current request into ``timeline_stage_seconds{stage=...}``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe("timeline_stage_seconds", seconds, stage=stage)
+        trace = _trace.get()
+        if trace is not None:
+            trace["spans"][stage] = round(trace["spans"].get(stage, 0.0) + seconds, 6)
+
+
+def record(name, value):
+    """Add ``value`` to the ``timeline_<name>_total`` counter and to the current trace."""
+    metrics.count(f"timeline_{name}_total", value)
+    trace = _trace.get()
+    if trace is not None:
+        trace["counters"][name] = trace["counters"].get(name, 0) + value
+
+
+class SlowestProfiles:
+    """Keep the cProfile stats of the ``keep`` slowest callbacks as .prof files in ``directory``."""
+
+    def __init__(self, directory, keep=PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._kept = []
+        os.makedirs(directory, exist_ok=True)
+
+    def offer(self, profiler, seconds, name):
+        with self._lock:
+            if len(self._kept) >= self.keep and seconds <= self._kept[0][0]:
+                return None
+            name = re.sub(r"[^\w.-]+", "_", name)
+            path = os.path.join(self.directory, f"{name}-{seconds * 1000:.0f}ms-{time.time():.0f}.prof")
+            profiler.dump_stats(path)
+            self._kept = sorted(self._kept + [(seconds, path)])
+            while len(self._kept) > self.keep:
+                os.remove(self._kept.pop(0)[1])
+            return path
+
+
+def _callback_name(request):
+    # The first output of a Dash callback names it: "timeline-graph.figure"
+    body = request.get_json(silent=True) or {}
+    output = body.get("output", "")
+    return output.strip(".").split("...")[0] or "unknown"
+
+
+def instrument_server(server, profiles=None):
+    """Time every request of the Flask ``server`` and serve the metrics on ``/metrics``.
+
+    Requests are counted per route (per callback for Dash updates) with
+    their latency and response size. The spans and counters recorded while
+    a request runs form its trace, logged as one JSON line when
+    TIMELINE_TRACE=1. With TIMELINE_PROFILE_DIR, Dash callbacks run under
+    cProfile, one at a time per process, and the stats of the slowest ones
+    are kept.
+    """
+    from flask import Response, g, request
+
+    if profiles is None and PROFILE_DIR:
+        profiles = SlowestProfiles(PROFILE_DIR)
+
+    @server.before_request
+    def start_trace():
+        route = request.url_rule.rule if request.url_rule else "other"
+        if route.endswith("_dash-update-component"):
+            route = f"callback:{_callback_name(request)}"
+        g.trace = {"route": route, "spans": {}, "counters": {}}
+        g.trace_token = _trace.set(g.trace)
+        g.trace_start = time.perf_counter()
+        g.profiler = None
+        # One callback is profiled at a time, the concurrent ones are not
+        if profiles is not None and route.startswith("callback:") and _profiling.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler, started outside the dashboard, is running
+                _profiling.release()
+            else:
+                g.profiler = profiler
+
+    @server.after_request
+    def measure_response(response):
+        trace = g.get("trace")
+        if trace is not None:
+            trace["status"] = response.status_code
+            trace["bytes"] = 0 if response.direct_passthrough else len(response.get_data())
+        return response
+
+    @server.teardown_request
+    def end_trace(exc):
+        trace = g.get("trace")
+        if trace is None:
+            return
+        seconds = time.perf_counter() - g.trace_start
+        if g.profiler is not None:
+            g.profiler.disable()
+            _profiling.release()
+            trace["profile"] = profiles.offer(g.profiler, seconds, trace["route"])
+        _trace.reset(g.trace_token)
+        status = trace.get("status", 500)
+        metrics.observe("http_request_seconds", seconds, route=trace["route"])
+        metrics.count("http_requests_total", route=trace["route"], status=status)
+        metrics.count("http_response_bytes_total", trace.get("bytes", 0), route=trace["route"])
+        if TRACE:
+            trace_logger.info(json.dumps({"time": time.time(), "seconds": round(seconds, 6), **trace},
+                                         ensure_ascii=False))
+
+    @server.route("/metrics")
+    def serve_metrics():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    return server
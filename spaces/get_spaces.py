@@ -1,16 +1,23 @@
-# clickup_api/lists/get_lists.py
+import sys
+import os
 
-from auth.oauth_handler import get_access_token
-import requests
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from auth.oauth_handler import token_manager
+from api.client import ClickUpClient
+from api.hierarchy import HierarchyCache
 
 def get_spaces():
-    token = get_access_token()
-    headers = {"Authorization": token}
-    url = "https://api.clickup.com/api/v2/space"
-    response = requests.get(url, headers=headers)
-    return response.json()
+    client = ClickUpClient(token_manager)
+    hierarchy = HierarchyCache()
+    spaces = []
+    for team in hierarchy.fetch(client, "/team", "teams"):
+        spaces.extend(hierarchy.fetch(client, f"/team/{team['id']}/space", "spaces"))
+    hierarchy.save()
+    client.close()
+    return {"spaces": spaces}
 
 if __name__ == "__main__":
     data = get_spaces()
-    for space in data.get("lists", []):
-        print(f"📂 List: {space['name']} (ID: {space['id']})")
+    for space in data.get("spaces", []):
+        print(f"📂 Space: {space['name']} (ID: {space['id']})")
@@ -0,0 +1,34 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def temp_path(path):
+    """A new, empty temporary file next to ``path``, unique to this call.
+
+    It keeps the extension of ``path`` (writers that pick a format from it
+    still work) and lives in the same directory, so ``os.replace`` stays atomic.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    stem, extension = os.path.splitext(name)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{stem}.", suffix=f".tmp{extension}")
+    os.close(fd)
+    return tmp
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path to write, swapped in as ``path`` when the block succeeds.
+
+    Readers see either the previous file or the complete new one, and two
+    processes writing the same file never share a temporary file. On error
+    the temporary file is removed and ``path`` is left untouched.
+    """
+    tmp = temp_path(path)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
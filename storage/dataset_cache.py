@@ -0,0 +1,59 @@
+import os
+import threading
+
+
+class DatasetCache:
+    """Keep the parsed task table in memory until the file behind it changes.
+
+    Every call costs one ``os.stat``. The file is identified by inode, mtime
+    and size: the store swaps files in with ``os.replace``, so each write gets
+    a new inode even when the mtime resolution is coarse. Each Dash worker
+    process holds its own cache and notices a new file on its next call; the
+    lock makes concurrent threads of one worker share a single reload.
+    The version is derived from that signature, so every process agrees on
+    it. Callers must treat the returned DataFrame as read-only.
+    """
+
+    def __init__(self, loader, path_func):
+        self._loader = loader
+        self._path_func = path_func
+        self._lock = threading.Lock()
+        # (signature, version, data), swapped as one object so readers never mix versions
+        self._entry = (None, None, None)
+
+    @property
+    def version(self):
+        return self._entry[1]
+
+    def _stat(self):
+        try:
+            st = os.stat(self._path_func())
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _version(signature):
+        # None while the file is missing
+        return None if signature is None else f"{signature[0]}-{signature[1]}"
+
+    def snapshot(self):
+        """Return ``(version, data)``; ``version`` names the file the data was read from."""
+        signature, version, data = self._entry
+        if data is not None and self._stat() == signature:
+            return version, data
+        with self._lock:
+            signature, version, data = self._entry
+            current = self._stat()
+            if data is None or current != signature:
+                data = self._loader()
+                version = self._version(current)
+                self._entry = (current, version, data)
+            return version, data
+
+    def get(self):
+        return self.snapshot()[1]
+
+    def invalidate(self):
+        with self._lock:
+            self._entry = (None, self._entry[1], None)
@@ -0,0 +1,167 @@
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from storage.atomic import atomic_path
+from storage.task_model import assignee_table
+from storage.task_store import TASK_STORE_BASENAME
+
+ROLLUPS_PATH = os.getenv("TIMELINE_ROLLUPS_PATH", TASK_STORE_BASENAME + ".rollups.parquet")
+# A cell holds the tasks of one list sharing the same assignees
+CELL_COLUMNS = ["space", "folder", "list", "assignee"]
+# Finished tasks are never overdue
+CLOSED_STATUSES = {"done", "complete", "closed"}
+# One task count column per status, named "status:<status>"
+STATUS_PREFIX = "status:"
+STAT_COLUMNS = ["order", "tasks", "start", "end", "overdue"]
+
+
+def rollups_path():
+    return ROLLUPS_PATH
+
+
+def today():
+    return pd.Timestamp(dt.date.today())
+
+
+def scheduled(df):
+    """The rows the timeline draws (start and due dates both set), with the columns rolled up."""
+    columns = ["task_id", "status", "start_date", "due_date", *CELL_COLUMNS]
+    return df.loc[df["start_date"].notna() & df["due_date"].notna(), [c for c in columns if c in df]]
+
+
+def _status_columns(frame):
+    return sorted(column for column in frame.columns if column.startswith(STATUS_PREFIX))
+
+
+def _merge(frame, keys):
+    # Cells (or rows taken as one-task cells) added up by ``keys``
+    grouped = frame.groupby(keys, sort=False, observed=True, dropna=False)
+    sums = grouped[["tasks", "overdue", *_status_columns(frame)]].sum()
+    merged = pd.concat([grouped[["order", "start"]].min(), grouped[["end"]].max(), sums], axis=1)
+    return merged.reset_index()
+
+
+def _tidy(cells, day):
+    statuses = _status_columns(cells)
+    cells = cells.reindex(columns=CELL_COLUMNS + STAT_COLUMNS + statuses)
+    for column in CELL_COLUMNS:
+        cells[column] = cells[column].astype("string")
+    for column in ["order", "tasks", "overdue", *statuses]:
+        cells[column] = cells[column].fillna(0).astype(np.int64)
+    cells["as_of"] = pd.Timestamp(day).as_unit("us")
+    return cells.sort_values("order", kind="stable").reset_index(drop=True)
+
+
+def _task_rows(df, day):
+    # The scheduled tasks of ``df`` as one-task cells
+    df = scheduled(df)
+    status_codes, statuses = pd.factorize(df["status"])
+    statuses = np.asarray(statuses, dtype=object).astype(str)
+    closed = np.array([status.lower() in CLOSED_STATUSES for status in statuses] + [False], dtype=bool)
+    end = df["due_date"].to_numpy()
+    return pd.DataFrame({
+        **{column: df[column].array for column in CELL_COLUMNS},
+        "order": df.index.to_numpy(),
+        "tasks": 1,
+        "start": df["start_date"].to_numpy(),
+        "end": end,
+        "overdue": (end < day.to_datetime64()) & ~closed[status_codes],
+        **{STATUS_PREFIX + status: status_codes == i for i, status in enumerate(statuses)},
+    })
+
+
+def build_rollups(df, day=None):
+    """Rollup index of the task table ``df``: its scheduled tasks added up per cell.
+
+    Each cell, a list and one set of assignees, gets its min start, max due,
+    task count, a task count per status, the number of open tasks due before
+    ``day`` (today by default) and ``order``, the index label of its first
+    row. ``summary`` derives the list, folder, space and assignee levels.
+    """
+    day = today() if day is None else pd.Timestamp(day)
+    return _tidy(_merge(_task_rows(df, day), CELL_COLUMNS), day)
+
+
+def combine_rollups(parts, day=None):
+    """Merge the rollup indexes of consecutive batches of rows into the index of all of them.
+
+    The ``order`` of each part must already be offset by the rows before it.
+    """
+    day = today() if day is None else pd.Timestamp(day)
+    return _tidy(_merge(pd.concat(parts, ignore_index=True), CELL_COLUMNS), day)
+
+
+def update_rollups(rollups, previous, df, changed_ids, removed_ids=(), day=None):
+    """Bring ``rollups`` (the index of ``previous``) up to date with ``df``.
+
+    ``df`` is ``previous`` with the ``changed_ids`` tasks upserted in place or
+    appended and the ``removed_ids`` dropped, as the sync merges them. Only
+    the lists holding a changed task, before or after, are added up again
+    from their rows; the other cells are kept as they are. The whole index is
+    rebuilt when there is none yet, when it was computed on another day (the
+    overdue counts moved) and when tasks were removed (later rows moved up).
+    """
+    day = today() if day is None else pd.Timestamp(day)
+    if rollups is None or rollups.empty or rollups["as_of"].iloc[0] != day:
+        return build_rollups(df, day)
+    if previous["task_id"].isin(list(removed_ids)).any():
+        return build_rollups(df, day)
+    changed_ids = list(changed_ids)
+    lists = set(previous.loc[previous["task_id"].isin(changed_ids), "list"])
+    lists |= set(df.loc[df["task_id"].isin(changed_ids), "list"])
+    if not lists:
+        return rollups
+    fresh = build_rollups(df[df["list"].isin(list(lists))], day)
+    kept = rollups[~rollups["list"].isin(list(lists))]
+    return _tidy(pd.concat([kept, fresh], ignore_index=True).drop(columns="as_of"), day)
+
+
+def summary(rollups, level):
+    """One row per group of ``level`` (list, folder, space or assignee), in display order.
+
+    Computed from the cells of the index only. Groups come in order of their
+    first task, assignees by name; a task counts once for each of its assignees.
+    """
+    cells = rollups
+    if level == "assignee":
+        table = assignee_table(cells["assignee"])
+        cells = cells.iloc[table["row"].to_numpy()].assign(assignee=table["assignee"].astype(str).to_numpy(), order=0)
+    cells = cells.drop(columns=[column for column in CELL_COLUMNS + ["as_of"] if column != level], errors="ignore")
+    groups = _merge(cells, [level]).rename(columns={level: "group"}).dropna(subset=["group"])
+    groups["group"] = groups["group"].astype(str)
+    return groups.sort_values(["order", "group"], kind="stable").reset_index(drop=True)
+
+
+def task_summary(df, level, day=None):
+    """``summary`` of ``level`` straight from the rows of ``df``, for selections the index does not cover."""
+    day = today() if day is None else pd.Timestamp(day)
+    return summary(_task_rows(df, day), level)
+
+
+def save_rollups(rollups, path=None):
+    path = path or rollups_path()
+    with atomic_path(path) as tmp:
+        rollups.to_parquet(tmp, index=False)
+    return path
+
+
+def load_rollups(path=None):
+    """The rollup index written by the last sync, None when there is none."""
+    path = path or rollups_path()
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def is_current(rollups, df, day=None):
+    """Whether ``rollups`` can stand for the timeline tasks ``df`` today.
+
+    A cheap check, in time proportional to the cells: the index must be of
+    today and hold as many scheduled tasks as ``df``.
+    """
+    day = today() if day is None else pd.Timestamp(day)
+    if rollups is None or rollups.empty:
+        return False
+    return rollups["as_of"].iloc[0] == day and int(rollups["tasks"].sum()) == len(scheduled(df))
@@ -0,0 +1,53 @@
+import os
+import pyarrow as pa
+
+from storage.atomic import atomic_path
+from storage.task_model import timeline_tasks
+from storage.task_store import TASK_STORE_BASENAME, load_tasks, store_path, to_typed
+
+# Publish the timeline dataset once and let every Dash worker map it
+SHARED_DATASET = os.getenv("TIMELINE_SHARED_DATASET", "0") == "1"
+SHARED_PATH = os.getenv("TIMELINE_SHARED_PATH", TASK_STORE_BASENAME + ".arrow")
+
+
+def shared_path():
+    return SHARED_PATH
+
+
+def dataset_path():
+    """The file ``map_dataset`` reads: the shared file once published, the task store before."""
+    path = shared_path()
+    return path if os.path.exists(path) else store_path()
+
+
+def publish_dataset(df=None, path=None):
+    """Write the timeline tasks as an uncompressed Arrow file that workers can map.
+
+    ``df`` defaults to the task store. Only the sync and the fetch CLI
+    publish. The file is swapped in with ``os.replace``: workers still
+    mapping the previous one keep a valid mapping until they remap, and the
+    new inode tells them to.
+    """
+    path = path or shared_path()
+    df = load_tasks() if df is None else to_typed(df)
+    table = pa.Table.from_pandas(timeline_tasks(df), preserve_index=False)
+    with atomic_path(path) as tmp:
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def map_dataset(path=None):
+    """Map the published dataset and return it as a DataFrame, without copying the data.
+
+    Text columns stay Arrow arrays over the mapping and dates are read in
+    place; only the small categorical codes are copied. The pages are shared
+    through the OS page cache by every process mapping the same file.
+    Until a sync has published it, each worker reads the task store instead:
+    workers never write the shared file themselves.
+    """
+    path = path or shared_path()
+    if not os.path.exists(path):
+        return timeline_tasks(load_tasks())
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+# Columns with few distinct values, repeated over every row
+CATEGORY_COLUMNS = ["type", "status", "priority", "assignee", "list", "folder", "space", "team"]
+
+
+def compact_tasks(df):
+    """In-memory model of the task table: categoricals instead of repeated strings.
+
+    Each distinct value is stored once and rows hold small integer codes.
+    ``task_id`` and ``parent_id`` stay Arrow-backed string columns, already
+    free of per-row Python objects: as categoricals their tens of thousands
+    of categories would be rebuilt by every worker mapping the shared dataset.
+    Values are unchanged, so every reader of the task table works on either form.
+    """
+    return df.astype({column: "category" for column in CATEGORY_COLUMNS if column in df})
+
+
+def timeline_tasks(df):
+    """The tasks the timeline can draw (both dates set), as a compact model."""
+    return compact_tasks(df.dropna(subset=["start_date", "due_date"]))
+
+
+def assignee_table(assignee):
+    """Normalized task↔assignee table: one ``(row, assignee)`` pair per person of each task.
+
+    ``row`` is the position of the task in the table. The comma-separated
+    values are split once per distinct value, not once per row.
+    """
+    assignee = assignee.astype("category")
+    people = [[name.strip() for name in value.split(",")] for value in assignee.cat.categories.astype(str)]
+    codes = assignee.cat.codes.to_numpy()
+    counts = np.array([len(names) for names in people] + [0], dtype=np.int64)[codes]
+    offsets = np.cumsum([0] + [len(names) for names in people])
+    flat = pd.Categorical([name for names in people for name in names])
+    picks = np.repeat(offsets[codes] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return pd.DataFrame({
+        "row": np.repeat(np.arange(len(codes), dtype=np.int32), counts),
+        "assignee": flat[picks] if len(picks) else pd.Categorical([]),
+    })
@@ -0,0 +1,151 @@
+import os
+from contextlib import ExitStack
+import pandas as pd
+
+from storage.atomic import atomic_path
+
+TASK_STORE_BASENAME = "all_clickup_tasks_with_subtasks"
+TASK_STORE_FORMAT = os.getenv("TASK_STORE_FORMAT", "parquet")
+
+DATE_COLUMNS = ["created_date", "start_date", "due_date"]
+ID_COLUMNS = ["task_id", "parent_id"]
+
+
+def _read_excel(path):
+    return to_typed(pd.read_excel(path, dtype={column: str for column in ID_COLUMNS}))
+
+
+def _write_excel(df, path):
+    df.to_excel(path, index=False)
+
+
+def _write_feather(df, path):
+    df.reset_index(drop=True).to_feather(path)
+
+
+BACKENDS = {
+    "parquet": (".parquet", pd.read_parquet, lambda df, path: df.to_parquet(path, index=False)),
+    "feather": (".feather", pd.read_feather, _write_feather),
+    "excel": (".xlsx", _read_excel, _write_excel),
+}
+
+
+def _backend(fmt):
+    fmt = fmt or TASK_STORE_FORMAT
+    if fmt not in BACKENDS:
+        raise ValueError(f"Format de stockage inconnu : {fmt} (attendu : {', '.join(BACKENDS)})")
+    return BACKENDS[fmt]
+
+
+def store_path(fmt=None):
+    return TASK_STORE_BASENAME + _backend(fmt)[0]
+
+
+def to_typed(df):
+    """Store dates as datetime64 and ids as strings, whatever the rows came in as."""
+    df = df.copy()
+    for column in DATE_COLUMNS:
+        if column in df:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    for column in ID_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("string")
+    return df
+
+
+def save_tasks(df, fmt=None, path=None):
+    # Write next to the target and swap, so readers never see a half-written file
+    _, _, write = _backend(fmt)
+    path = path or store_path(fmt)
+    with atomic_path(path) as tmp:
+        write(to_typed(df), tmp)
+    return path
+
+
+def load_tasks(fmt=None, path=None):
+    _, read, _ = _backend(fmt)
+    return read(path or store_path(fmt))
+
+
+class TaskStoreWriter:
+    """Write the task table in batches instead of from one big DataFrame.
+
+    DataFrames of rows are buffered up to ``batch_rows`` rows and flushed as
+    one Parquet row group or Feather record batch, so memory stays bounded by
+    the batch size whatever the number of tasks. The file appears atomically on ``close``.
+    Excel cannot be appended to: rows are then kept and saved in one go.
+    """
+
+    def __init__(self, fmt=None, path=None, batch_rows=50_000):
+        self.fmt = fmt or TASK_STORE_FORMAT
+        self.path = path or store_path(self.fmt)
+        self._target = ExitStack()
+        self.tmp = self._target.enter_context(atomic_path(self.path))
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._buffer = []
+        self._buffered = 0
+        self._schema = None
+        self._writer = None
+
+    def write_rows(self, df):
+        self._buffer.append(df)
+        self._buffered += len(df)
+        if self._buffered >= self.batch_rows and self.fmt != "excel":
+            self.flush()
+
+    def _take(self):
+        df = pd.concat(self._buffer, ignore_index=True) if self._buffer else pd.DataFrame()
+        self._buffer, self._buffered = [], 0
+        return df
+
+    def flush(self):
+        import pyarrow as pa
+
+        if not self._buffer:
+            return
+        df = to_typed(self._take())
+        if self._writer is None:
+            # Columns that are empty in the first batch would be typed null
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in schema
+            ], metadata=schema.metadata)
+            self._writer = self._open(self._schema)
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        self.rows_written += len(df)
+
+    def _open(self, schema):
+        import pyarrow as pa
+
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.tmp, schema)
+        return pa.ipc.new_file(self.tmp, schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+
+    def close(self):
+        if self._writer is None:
+            df = self._take()
+            _backend(self.fmt)[2](to_typed(df), self.tmp)
+            self.rows_written = len(df)
+        else:
+            self.flush()
+            self._writer.close()
+        self._target.close()
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            if self._writer is not None:
+                self._writer.close()
+            self._target.__exit__(exc_type, exc, tb)
+
+
+def export_excel(df, path=TASK_STORE_BASENAME + ".xlsx"):
+    return save_tasks(df, fmt="excel", path=path)
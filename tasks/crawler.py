@@ -0,0 +1,167 @@
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from auth.oauth_handler import token_manager
+from api.client import ClickUpAPIError, ClickUpClient
+from api.hierarchy import HierarchyCache
+from tasks.pagination import iter_list_tasks
+
+DEFAULT_CONCURRENCY = int(os.getenv("CLICKUP_CONCURRENCY", "8"))
+
+
+# Lists created directly in a space, outside any folder
+FOLDERLESS = "Sans dossier"
+
+
+def is_gone(error):
+    """Whether ``error`` may come from an item deleted in ClickUp since the hierarchy was cached.
+
+    ClickUp answers a client error (404, 400, 401) for deleted items; rate
+    limiting is retried by the client and never means that.
+    """
+    return 400 <= error.status_code < 500 and error.status_code != 429
+
+
+def crawl_lists(client, pool, timings, hierarchy=None):
+    """Return ``(team_name, space_name, folder_name, list)`` for every list of the workspace.
+
+    Levels are read through ``hierarchy`` (a HierarchyCache), so a fresh cache
+    costs no request at all. Folderless lists come after the folder lists.
+    """
+    hierarchy = hierarchy or HierarchyCache()
+
+    def fetch(path, key):
+        return hierarchy.fetch(client, path, key)
+
+    start = time.perf_counter()
+    teams = fetch("/team", "teams")
+    timings["teams"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = pool.map(lambda team: fetch(f"/team/{team['id']}/space", "spaces"), teams)
+    spaces = [
+        (team["name"], space)
+        for team, team_spaces in zip(teams, results)
+        for space in team_spaces
+    ]
+    timings["spaces"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = pool.map(lambda item: fetch(f"/space/{item[1]['id']}/folder", "folders"), spaces)
+    folders = [
+        (team_name, space["name"], folder)
+        for (team_name, space), space_folders in zip(spaces, results)
+        for folder in space_folders
+    ]
+    timings["folders"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = pool.map(lambda item: fetch(f"/folder/{item[2]['id']}/list", "lists"), folders)
+    lists = [
+        (team_name, space_name, folder["name"], lst)
+        for (team_name, space_name, folder), folder_lists in zip(folders, results)
+        for lst in folder_lists
+    ]
+    results = pool.map(lambda item: fetch(f"/space/{item[1]['id']}/list", "lists"), spaces)
+    lists += [
+        (team_name, space["name"], FOLDERLESS, lst)
+        for (team_name, space), space_lists in zip(spaces, results)
+        for lst in space_lists
+    ]
+    timings["lists"] = time.perf_counter() - start
+    hierarchy.save()
+    return lists
+
+
+def revalidated_lists(client, pool, timings, hierarchy):
+    """``crawl_lists`` after revalidating ``hierarchy`` whatever its age."""
+    hierarchy.refresh = True
+    return crawl_lists(client, pool, timings, hierarchy)
+
+
+def cached_lists(client, pool, timings, hierarchy):
+    """``crawl_lists``, revalidating ``hierarchy`` when a cached space or folder is gone."""
+    try:
+        return crawl_lists(client, pool, timings, hierarchy)
+    except ClickUpAPIError as e:
+        if hierarchy.refresh or not is_gone(e):
+            raise
+        return revalidated_lists(client, pool, timings, hierarchy)
+
+
+def crawl_workspace(task_params, concurrency=DEFAULT_CONCURRENCY, timings=None, progress=None, metrics=None,
+                    refresh_hierarchy=False):
+    """Walk team → space → folder → list → tasks, one level at a time.
+
+    Every request of a level is sent through a bounded thread pool sharing a
+    single rate-limited ClickUpClient, and the task level follows every page of each
+    list. ``pool.map`` keeps the results in the same order as the sequential
+    crawl, so callers get identical rows. ``task_params`` is either a dict of
+    query parameters or a callable ``list_id -> dict``.
+    Returns a list of ``(team_name, space_name, folder_name, list, tasks)``
+    tuples and fills ``timings`` (if given) with the seconds spent on each level.
+    ``progress(done, total)`` is called as lists finish downloading and
+    ``metrics`` (if given) receives the HTTP counters of the client. The
+    hierarchy comes from the shared cache; ``refresh_hierarchy`` revalidates
+    it whatever its age. A cached list or folder answering a client error is
+    taken as deleted: the hierarchy is then revalidated and the lists that
+    are gone are left out, so callers drop their tasks.
+    """
+    client = ClickUpClient(token_manager, pool_size=concurrency)
+    timings = {} if timings is None else timings
+    params_for = task_params if callable(task_params) else lambda list_id: task_params
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        hierarchy = HierarchyCache(refresh=refresh_hierarchy)
+        lists = cached_lists(client, pool, timings, hierarchy)
+
+        start = time.perf_counter()
+        done = [0]
+        done_lock = threading.Lock()
+
+        def list_tasks(item, missing_ok=False):
+            # None when the list answers a client error and ``missing_ok``
+            try:
+                tasks = list(iter_list_tasks(client, item[3]["id"], params_for(item[3]["id"])))
+            except ClickUpAPIError as e:
+                if not (missing_ok and is_gone(e)):
+                    raise
+                return None
+            if progress:
+                with done_lock:
+                    done[0] += 1
+                    progress(done[0], len(lists))
+            return tasks
+
+        if progress:
+            progress(0, len(lists))
+        results = list(pool.map(lambda item: list_tasks(item, missing_ok=not hierarchy.refresh), lists))
+        if any(tasks is None for tasks in results):
+            # The cached hierarchy held a deleted list: revalidate it and drop
+            # the lists that are gone. The others, lists created since
+            # included, are fetched now and may no longer fail.
+            fetched = {item[3]["id"]: tasks for item, tasks in zip(lists, results) if tasks is not None}
+            lists = revalidated_lists(client, pool, timings, hierarchy)
+            results = pool.map(
+                lambda item: fetched[item[3]["id"]] if item[3]["id"] in fetched else list_tasks(item), lists
+            )
+        crawled = [
+            (team_name, space_name, folder_name, lst, tasks)
+            for (team_name, space_name, folder_name, lst), tasks in zip(lists, results)
+        ]
+        timings["tasks"] = time.perf_counter() - start
+
+    client.close()
+    if metrics is not None:
+        metrics.update(client.metrics)
+    return crawled
+
+
+def print_timings(timings):
+    print("\n⏱️ Temps par niveau :")
+    for level, seconds in timings.items():
+        print(f"   {level:<8} {seconds:.2f}s")
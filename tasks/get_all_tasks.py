@@ -1,49 +1,25 @@
 import sys
 import os
-import requests
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from auth.oauth_handler import get_access_token
+from tasks.crawler import DEFAULT_CONCURRENCY, crawl_workspace
 
 
-def get_all_tasks():
-    token = get_access_token()
-    headers = {"Authorization": token}
+def get_all_tasks(concurrency=DEFAULT_CONCURRENCY):
     all_tasks = []
-
-    res_team = requests.get("https://api.clickup.com/api/v2/team", headers=headers)
-    for team in res_team.json().get("teams", []):
-        team_id = team["id"]
-        team_name = team["name"]
-
-        res_spaces = requests.get(f"https://api.clickup.com/api/v2/team/{team_id}/space", headers=headers)
-        for space in res_spaces.json().get("spaces", []):
-            space_id = space["id"]
-            space_name = space["name"]
-
-            res_folders = requests.get(f"https://api.clickup.com/api/v2/space/{space_id}/folder", headers=headers)
-            for folder in res_folders.json().get("folders", []):
-                folder_id = folder["id"]
-                folder_name = folder["name"]
-
-                res_lists = requests.get(f"https://api.clickup.com/api/v2/folder/{folder_id}/list", headers=headers)
-                for lst in res_lists.json().get("lists", []):
-                    list_id = lst["id"]
-                    list_name = lst["name"]
-
-                    res_tasks = requests.get(f"https://api.clickup.com/api/v2/list/{list_id}/task", headers=headers)
-                    for task in res_tasks.json().get("tasks", []):
-                        all_tasks.append({
-                            "task_id": task["id"],
-                            "task_name": task["name"],
-                            "status": task["status"]["status"],
-                            "assignee": task["assignees"][0]["username"] if task["assignees"] else "Non assignée",
-                            "created": task["date_created"],
-                            "list_name": list_name,
-                            "folder": folder_name,
-                            "space": space_name,
-                            "team": team_name
-                        })
+    for team_name, space_name, folder_name, lst, tasks in crawl_workspace({}, concurrency=concurrency):
+        for task in tasks:
+            all_tasks.append({
+                "task_id": task["id"],
+                "task_name": task["name"],
+                "status": task["status"]["status"],
+                "assignee": task["assignees"][0]["username"] if task["assignees"] else "Non assignée",
+                "created": task["date_created"],
+                "list_name": lst["name"],
+                "folder": folder_name,
+                "space": space_name,
+                "team": team_name
+            })
     return all_tasks
 
 
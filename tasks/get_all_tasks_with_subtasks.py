@@ -1,96 +1,220 @@
 import sys
 import os
-import requests
-import pandas as pd
-from datetime import datetime
+import time
+import argparse
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from auth.oauth_handler import get_access_token
-
-def get_all_tasks_with_subtasks():
-    token = get_access_token()
-    headers = {"Authorization": token}
-    all_tasks = []
-
-    res_team = requests.get("https://api.clickup.com/api/v2/team", headers=headers)
-    for team in res_team.json().get("teams", []):
-        team_id = team["id"]
-        team_name = team["name"]
-
-        res_spaces = requests.get(f"https://api.clickup.com/api/v2/team/{team_id}/space", headers=headers)
-        for space in res_spaces.json().get("spaces", []):
-            space_id = space["id"]
-            space_name = space["name"]
-
-            res_folders = requests.get(f"https://api.clickup.com/api/v2/space/{space_id}/folder", headers=headers)
-            for folder in res_folders.json().get("folders", []):
-                folder_id = folder["id"]
-                folder_name = folder["name"]
-
-                res_lists = requests.get(f"https://api.clickup.com/api/v2/folder/{folder_id}/list", headers=headers)
-                for lst in res_lists.json().get("lists", []):
-                    list_id = lst["id"]
-                    list_name = lst["name"]
-
-                    url = f"https://api.clickup.com/api/v2/list/{list_id}/task?subtasks=true&include_closed=true"
-                    res_tasks = requests.get(url, headers=headers)
-
-                    for task in res_tasks.json().get("tasks", []):
-                        task_type = "subtask" if task.get("parent") else "task"
-                        created_date = int(task["date_created"]) / 1000 if task.get("date_created") else None
-                        start_date = int(task["start_date"]) / 1000 if task.get("start_date") else None
-                        due_date = int(task["due_date"]) / 1000 if task.get("due_date") else None
-
-                        task_id = task["id"]
-                        parent_id = task["parent"] if task_type == "subtask" and "parent" in task else task_id
-
-                        priority_label = task["priority"]["priority"] if task.get("priority") and isinstance(task["priority"], dict) else "Non précisée"
-
-                        if task.get("assignees"):
-                            assignees = ", ".join([
-                                a["username"] if a.get("username") else a.get("email", "Inconnu")
-                                for a in task.get("assignees", [])
-                            ])
-                            if not assignees:
-                                assignees = "Non assignée"
-
-                        else:
-                            assignees = "Non assignée"
-
-                        assignees = ", ".join([
-                            (a.get("username") or a.get("email", "Inconnu")).split("@")[0]
-                            for a in task.get("assignees", [])
-                        ]) or "Non assignée"
-
-
-                        all_tasks.append({
-                            "type": task_type,
-                            "task_id": task_id,
-                            "parent_id": parent_id,
-                            "task_name": task["name"],
-                            "status": task["status"]["status"],
-                            "assignee": assignees,
-                            "priority": priority_label,
-                            "created_date": datetime.fromtimestamp(created_date).strftime("%Y-%m-%d %H:%M") if created_date else None,
-                            "start_date": datetime.fromtimestamp(start_date).strftime("%Y-%m-%d") if start_date else None,
-                            "due_date": datetime.fromtimestamp(due_date).strftime("%Y-%m-%d") if due_date else None,
-                            "list": list_name,
-                            "folder": folder_name,
-                            "space": space_name,
-                            "team": team_name
-                        })
-
-    return all_tasks
-
-
-if __name__ == "__main__":
-    tasks = get_all_tasks_with_subtasks()
-    print(f"\n✅ {len(tasks)} tâches récupérées (avec subtasks, done, dates)\n")
-
-    for task in tasks:
+from concurrent.futures import ThreadPoolExecutor
+from auth.oauth_handler import token_manager
+from tasks.crawler import DEFAULT_CONCURRENCY, cached_lists, crawl_workspace, is_gone, print_timings, revalidated_lists
+from tasks.pagination import iter_pages
+from tasks.normalize import TaskColumns
+from api.client import ClickUpAPIError, ClickUpClient, print_metrics
+from api.hierarchy import HierarchyCache
+from storage.task_store import TaskStoreWriter, export_excel, load_tasks
+from storage.shared_dataset import SHARED_DATASET, publish_dataset, shared_path
+from storage.rollups import build_rollups, combine_rollups, save_rollups
+
+TASK_PARAMS = {"subtasks": "true", "include_closed": "true"}
+
+# Rough footprint used to turn --max-memory into queue and batch sizes
+BASELINE_MB = 150  # interpreter, pandas and pyarrow once imported
+PAGE_MB = 2        # one decoded page of 100 tasks
+ROW_KB = 2         # one normalized row waiting in the write batch
+
+
+def get_all_tasks_with_subtasks(concurrency=DEFAULT_CONCURRENCY, timings=None, metrics=None):
+    all_tasks = TaskColumns()
+    crawled = crawl_workspace(TASK_PARAMS, concurrency=concurrency, timings=timings, metrics=metrics)
+    for team_name, space_name, folder_name, lst, tasks in crawled:
+        all_tasks.add(tasks, team_name, space_name, folder_name, lst["name"])
+
+    return all_tasks.to_frame()
+
+
+def streaming_settings(max_memory, concurrency):
+    """Return ``(concurrency, max_pending, batch_rows)`` fitting in ``max_memory`` MB.
+
+    Half of what is left above the baseline goes to pages in flight (one per
+    worker plus the queue), the other half to the write batch.
+    """
+    budget = max(max_memory - BASELINE_MB, 16) / 2
+    pages = max(2, int(budget / PAGE_MB))
+    concurrency = max(1, min(concurrency, pages // 2))
+    batch_rows = max(1000, int(budget * 1024 / ROW_KB))
+    return concurrency, pages - concurrency, batch_rows
+
+
+def normalize_pages(pages, batch_rows=10_000):
+    """Turn pages of raw tasks into typed DataFrames of about ``batch_rows`` rows."""
+    columns = TaskColumns()
+    for (team_name, space_name, folder_name, lst), tasks in pages:
+        columns.add(tasks, team_name, space_name, folder_name, lst["name"])
+        if columns.size >= batch_rows:
+            yield columns.to_frame()
+            columns = TaskColumns()
+    if columns.size:
+        yield columns.to_frame()
+
+
+def stream_all_tasks_with_subtasks(path=None, fmt=None, concurrency=DEFAULT_CONCURRENCY, max_memory=None,
+                                   timings=None, metrics=None, on_rows=None, client=None, hierarchy=None):
+    """Crawl every task straight to the task store, without holding the workspace in memory.
+
+    Pages flow from the API through ``normalize_pages`` into a TaskStoreWriter,
+    in the same order as ``get_all_tasks_with_subtasks``. ``max_memory`` (MB)
+    bounds the pages in flight and the write batch. ``on_rows`` is called with
+    each normalized batch (a DataFrame). ``client`` and ``hierarchy`` default to a new
+    ClickUpClient and the shared HierarchyCache. Lists deleted since the
+    hierarchy was cached are left out, as in ``crawl_workspace``. The default
+    store is written like a full sync, under the sync lock and recorded in the
+    status file: it gets its rollup index, added up batch by batch, the
+    shared dataset when enabled and a fresh sync state.
+    Raises SyncInProgress when a sync is already running.
+    Returns ``(path, rows_written)``.
+    """
+    # Imported here: tasks.sync_tasks imports this module
+    from tasks.sync_tasks import load_state, locked_sync, save_state
+
+    max_pending, batch_rows = None, 50_000
+    if max_memory:
+        concurrency, max_pending, batch_rows = streaming_settings(max_memory, concurrency)
+    timings = {} if timings is None else timings
+    own_client = client is None
+    if own_client:
+        client = ClickUpClient(token_manager, pool_size=concurrency)
+    hierarchy = hierarchy or HierarchyCache()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        lists = cached_lists(client, pool, timings, hierarchy)
+
+    def write(report=None):
+        start = time.perf_counter()
+        rollups, offset = [], [0]
+        # The sync state of the lists read, as a full sync leaves it
+        state = {lst["id"]: {"date_updated": None, "task_ids": []} for *_, lst in lists}
+        positions = {lst["id"]: position for position, (*_, lst) in enumerate(lists)}
+        gone = {}
+
+        def on_error(item, error):
+            # Before revalidation, a client error may come from a deleted list
+            if isinstance(error, ClickUpAPIError) and is_gone(error) and not hierarchy.refresh:
+                gone[item[3]["id"]] = error
+                return True
+            return False
+
+        def track(pages):
+            for item, tasks in pages:
+                entry = state[item[3]["id"]]
+                entry["task_ids"] += [task["id"] for task in tasks]
+                marks = [int(task["date_updated"]) for task in tasks if task.get("date_updated")]
+                if entry["date_updated"]:
+                    marks.append(int(entry["date_updated"]))
+                entry["date_updated"] = str(max(marks)) if marks else None
+                if report:
+                    report(positions[item[3]["id"]], len(positions))
+                yield item, tasks
+
+        def stream(writer, batch):
+            pages = track(iter_pages(client, batch, lambda list_id: TASK_PARAMS, concurrency, max_pending,
+                                     ordered=True, on_error=on_error))
+            for rows in normalize_pages(pages, min(batch_rows, 10_000)):
+                if on_rows:
+                    on_rows(rows)
+                writer.write_rows(rows)
+                if path is None:
+                    rollups.append(build_rollups(rows.set_axis(rows.index + offset[0])))
+                    offset[0] += len(rows)
+
+        if report:
+            report(0, len(positions))
+        with TaskStoreWriter(fmt=fmt, path=path, batch_rows=batch_rows) as writer:
+            stream(writer, lists)
+            if gone:
+                # The cached hierarchy held deleted lists: revalidate it, drop
+                # the lists that are gone and read the lists created since
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    fresh = revalidated_lists(client, pool, timings, hierarchy)
+                fresh_ids = {lst["id"] for *_, lst in fresh}
+                for list_id, error in gone.items():
+                    if list_id in fresh_ids:
+                        raise error
+                    del state[list_id]
+                added = [item for item in fresh if item[3]["id"] not in positions]
+                for *_, lst in added:
+                    state[lst["id"]] = {"date_updated": None, "task_ids": []}
+                    positions[lst["id"]] = len(positions)
+                stream(writer, added)
+            if rollups:
+                save_rollups(combine_rollups(rollups))
+        if path is None:
+            if SHARED_DATASET:
+                publish_dataset(load_tasks(path=writer.path))
+            for entry in state.values():
+                entry["task_ids"] = sorted(set(entry["task_ids"]))
+            save_state({"lists": state, "syncs_since_reconcile": 0})
+        if report:
+            report(len(positions), len(positions))
+        timings["tasks"] = time.perf_counter() - start
+        return writer, state
+
+    if path is None:
+        written = []
+
+        def job(report):
+            previous = load_state().get("lists", {}).values()
+            writer, state = write(report)
+            written.append(writer)
+            task_ids = {task_id for entry in state.values() for task_id in entry["task_ids"]}
+            removed = {task_id for entry in previous for task_id in entry["task_ids"]} - task_ids
+            return {"mode": "full", "updated": writer.rows_written, "removed": len(removed),
+                    "total": writer.rows_written}
+
+        locked_sync(job)
+        writer = written[0]
+    else:
+        writer, _ = write()
+
+    if own_client:
+        client.close()
+    if metrics is not None:
+        metrics.update(client.metrics)
+    return writer.path, writer.rows_written
+
+
+def print_rows(rows):
+    for task in rows.to_dict("records"):
         prefix = "└─🧷" if task["type"] == "subtask" else "📌"
         print(f"{prefix} {task['task_name']} - {task['status']} - {task['list']} - {task['assignee']} - {task['priority']}")
 
-    df = pd.DataFrame(tasks)
-    df.to_excel("all_clickup_tasks_with_subtasks.xlsx", index=False)
-    print("\n📁 Fichier exporté : all_clickup_tasks_with_subtasks.xlsx")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--excel", action="store_true", help="exporter aussi une copie .xlsx")
+    parser.add_argument("--max-memory", type=int, help="mémoire visée en Mo (borne les pages en vol et les lots écrits)")
+    parser.add_argument("--quiet", action="store_true", help="ne pas afficher chaque tâche")
+    args = parser.parse_args()
+
+    from tasks.sync_tasks import SyncInProgress
+
+    timings = {}
+    metrics = {}
+    try:
+        path, count = stream_all_tasks_with_subtasks(
+            concurrency=args.concurrency, max_memory=args.max_memory,
+            timings=timings, metrics=metrics, on_rows=None if args.quiet else print_rows,
+        )
+    except SyncInProgress as e:
+        print(f"⏸️ {e}")
+        sys.exit(1)
+    print(f"\n✅ {count} tâches récupérées (avec subtasks, done, dates)")
+
+    print_timings(timings)
+    print_metrics(metrics)
+
+    print(f"\n📁 Fichier exporté : {path}")
+    if SHARED_DATASET:
+        print(f"📁 Jeu de données partagé : {shared_path()}")
+    if args.excel:
+        print(f"📁 Export Excel : {export_excel(load_tasks(path=path))}")
@@ -0,0 +1,91 @@
+import time
+import numpy as np
+import pandas as pd
+
+TASK_COLUMNS = [
+    "type", "task_id", "parent_id", "task_name", "status", "assignee", "priority",
+    "created_date", "start_date", "due_date", "list", "folder", "space", "team",
+]
+# Raw epoch-millisecond field of the API → store column, and the precision kept
+DATE_FIELDS = {"date_created": ("created_date", "min"), "start_date": ("start_date", "D"), "due_date": ("due_date", "D")}
+LOCATION_COLUMNS = ["list", "folder", "space", "team"]
+
+
+def _assignees(task):
+    return ", ".join([
+        (a.get("username") or a.get("email", "Inconnu")).split("@")[0]
+        for a in task.get("assignees") or []
+    ]) or "Non assignée"
+
+
+def _priority(task):
+    priority = task.get("priority")
+    return priority["priority"] if priority and isinstance(priority, dict) else "Non précisée"
+
+
+def local_datetimes(values, freq):
+    """Epoch milliseconds (strings, numbers or None) to naive local datetime64, floored to ``freq``.
+
+    The store holds local dates, as ``datetime.fromtimestamp`` gave them. The
+    UTC offset is looked up once per distinct minute (time zones change on
+    whole minutes) instead of once per value.
+    """
+    ms = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(ms)
+    ms = ms[valid].astype(np.int64)
+    minutes, inverse = np.unique(ms // 60_000, return_inverse=True)
+    offsets = np.array([time.localtime(minute * 60).tm_gmtoff for minute in minutes.tolist()], dtype=np.int64)
+    local = np.full(len(valid), np.datetime64("NaT"), dtype="datetime64[ms]")
+    local[valid] = (ms + offsets[inverse] * 1000).astype("datetime64[ms]")
+    return pd.Series(local).dt.floor(freq).astype("datetime64[us]")
+
+
+class TaskColumns:
+    """Raw tasks gathered column by column, then converted in bulk by ``to_frame``.
+
+    ``add`` only copies fields out of the API JSON; dates, parent ids and
+    dtypes are handled once per batch with vectorized operations instead of
+    per-task formatting.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._columns = {name: [] for name in ["id", "parent", "name", "status", "assignee", "priority",
+                                               *DATE_FIELDS, *LOCATION_COLUMNS]}
+
+    def add(self, tasks, team_name, space_name, folder_name, list_name):
+        columns = self._columns
+        columns["id"] += [task["id"] for task in tasks]
+        columns["parent"] += [task.get("parent") or None for task in tasks]
+        columns["name"] += [task["name"] for task in tasks]
+        columns["status"] += [task["status"]["status"] for task in tasks]
+        columns["assignee"] += [_assignees(task) for task in tasks]
+        columns["priority"] += [_priority(task) for task in tasks]
+        for field in DATE_FIELDS:
+            columns[field] += [task.get(field) or None for task in tasks]
+        for column, value in zip(LOCATION_COLUMNS, [list_name, folder_name, space_name, team_name]):
+            columns[column] += [value] * len(tasks)
+        self.size += len(tasks)
+
+    def to_frame(self):
+        columns = self._columns
+        task_id = pd.Series(columns["id"], dtype="string")
+        parent = pd.Series(columns["parent"], dtype="string")
+        return pd.DataFrame({
+            "type": np.where(parent.isna(), "task", "subtask"),
+            "task_id": task_id,
+            "parent_id": parent.fillna(task_id),
+            "task_name": columns["name"],
+            "status": columns["status"],
+            "assignee": columns["assignee"],
+            "priority": columns["priority"],
+            **{column: local_datetimes(columns[field], freq) for field, (column, freq) in DATE_FIELDS.items()},
+            **{column: columns[column] for column in LOCATION_COLUMNS},
+        }, columns=TASK_COLUMNS)
+
+
+def normalize_tasks(tasks, team_name, space_name, folder_name, list_name):
+    """Typed task rows of one list, as a DataFrame with the columns of the task store."""
+    columns = TaskColumns()
+    columns.add(tasks, team_name, space_name, folder_name, list_name)
+    return columns.to_frame()
@@ -0,0 +1,95 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_list_pages(client, list_id, params=None):
+    """Yield the task pages of one list lazily, until ClickUp flags ``last_page``.
+
+    Responses that predate ``last_page`` stop on the first empty page.
+    """
+    page = 0
+    while True:
+        body = client.get(f"/list/{list_id}/task", params={**(params or {}), "page": page})
+        tasks = body.get("tasks", [])
+        if tasks:
+            yield tasks
+        if body.get("last_page") or not tasks:
+            return
+        page += 1
+
+
+def iter_list_tasks(client, list_id, params=None):
+    for tasks in iter_list_pages(client, list_id, params):
+        yield from tasks
+
+
+_END = object()
+
+
+def iter_pages(client, lists, params_for, concurrency, max_pending=None, ordered=False, on_error=None):
+    """Paginate several lists at once and yield ``(item, tasks)`` pages as they arrive.
+
+    ``lists`` holds ``(team_name, space_name, folder_name, list)`` tuples as
+    returned by ``crawl_lists``. At most ``max_pending`` pages wait in the
+    queue, so workers block instead of buffering a whole workspace when the
+    consumer is slower than the API. Pages of different lists interleave,
+    unless ``ordered``: each list then gets its own small queue and lists are
+    drained in order while the next ones prefetch. A list whose request fails
+    ends there when ``on_error(item, error)`` returns True; otherwise the
+    error is raised to the consumer.
+    """
+    max_pending = max_pending or concurrency * 2
+    if ordered:
+        queues = [queue.Queue(maxsize=max(1, max_pending // concurrency)) for _ in lists]
+    else:
+        queues = [queue.Queue(maxsize=max_pending)] * len(lists)
+    stop = threading.Event()
+
+    def put(pending, entry):
+        while not stop.is_set():
+            try:
+                pending.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def paginate(position, item):
+        list_id = item[3]["id"]
+        try:
+            for tasks in iter_list_pages(client, list_id, params_for(list_id)):
+                if not put(queues[position], (item, tasks)):
+                    return
+        except Exception as e:
+            if not (on_error and on_error(item, e)):
+                raise
+        finally:
+            if ordered:
+                put(queues[position], _END)
+
+    # Lists are submitted in order, so the list being drained always holds a worker
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = [pool.submit(paginate, position, item) for position, item in enumerate(lists)]
+        if ordered:
+            for pending, future in zip(queues, futures):
+                while True:
+                    entry = pending.get()
+                    if entry is _END:
+                        break
+                    yield entry
+                future.result()
+        elif lists:
+            pending = queues[0]
+            while True:
+                try:
+                    yield pending.get(timeout=0.1)
+                except queue.Empty:
+                    if all(future.done() for future in futures) and pending.empty():
+                        break
+        for future in futures:
+            future.result()
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+import random
+import argparse
+import datetime as dt
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tasks.crawler import DEFAULT_CONCURRENCY
+from tasks.sync_tasks import SyncInProgress, sync_tasks
+
+SYNC_INTERVAL = int(os.getenv("CLICKUP_SYNC_INTERVAL", "900"))
+SYNC_JITTER = float(os.getenv("CLICKUP_SYNC_JITTER", "0.1"))
+RETRY_BASE = 30
+MAX_BACKOFF = int(os.getenv("CLICKUP_SYNC_MAX_BACKOFF", "3600"))
+
+
+def next_delay(interval, jitter, failures, max_backoff=MAX_BACKOFF):
+    """Seconds until the next sync: the interval after a success, an
+    exponential backoff (capped at ``max_backoff``) after consecutive failures,
+    spread by ±``jitter`` so several daemons do not hit ClickUp together."""
+    delay = interval if not failures else min(max_backoff, RETRY_BASE * 2 ** (failures - 1))
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+def run(interval=SYNC_INTERVAL, jitter=SYNC_JITTER, concurrency=DEFAULT_CONCURRENCY, once=False):
+    # Each sync swaps the store file atomically; web workers notice the new
+    # file on their next request, no restart needed.
+    failures = 0
+    while True:
+        now = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            summary = sync_tasks(concurrency=concurrency)
+            failures = 0
+            print(f"✅ [{now}] Synchro {summary['mode']} : {summary['updated']} mises à jour, "
+                  f"{summary['removed']} supprimées, {summary['total']} au total", flush=True)
+        except SyncInProgress as e:
+            print(f"⏸️ [{now}] {e}, on attend le prochain cycle", flush=True)
+        except Exception as e:
+            failures += 1
+            print(f"❌ [{now}] Échec de la synchro ({failures}) : {e}", flush=True)
+        if once:
+            return failures == 0
+        delay = next_delay(interval, jitter, failures)
+        print(f"💤 Prochaine synchro dans {delay:.0f}s", flush=True)
+        time.sleep(delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synchronise périodiquement les tâches ClickUp")
+    parser.add_argument("--interval", type=int, default=SYNC_INTERVAL, help="secondes entre deux synchros")
+    parser.add_argument("--jitter", type=float, default=SYNC_JITTER, help="variation aléatoire (0.1 = ±10%%)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--once", action="store_true", help="une seule synchro puis quitter")
+    args = parser.parse_args()
+    try:
+        ok = run(args.interval, args.jitter, args.concurrency, once=args.once)
+    except KeyboardInterrupt:
+        ok = True
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,302 @@
+import sys
+import os
+import json
+import time
+import socket
+import argparse
+from contextlib import contextmanager
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from auth.oauth_handler import DATA_DIR
+from tasks.crawler import DEFAULT_CONCURRENCY, crawl_workspace, print_timings
+from api.client import print_metrics
+from tasks.get_all_tasks_with_subtasks import TASK_PARAMS
+from tasks.normalize import TaskColumns
+from storage.atomic import atomic_path
+from storage.task_store import load_tasks, save_tasks, store_path, to_typed
+from storage.shared_dataset import SHARED_DATASET, publish_dataset
+from storage.rollups import build_rollups, load_rollups, save_rollups, update_rollups
+
+STATE_FILE = os.path.join(DATA_DIR, "sync_state.json")
+STATUS_FILE = os.path.join(DATA_DIR, "sync_status.json")
+LOCK_FILE = os.path.join(DATA_DIR, "sync.lock")
+# A lock of another host not touched for this long is left over from a crashed sync
+LOCK_STALE_SECONDS = 3600
+# Minimum seconds between two progress writes to the status file
+PROGRESS_EVERY = 0.5
+
+# Deleted tasks never show up in a date_updated_gt query, so every
+# RECONCILE_EVERY incremental syncs the lists are re-read in full.
+RECONCILE_EVERY = int(os.getenv("CLICKUP_RECONCILE_EVERY", "24"))
+
+
+class SyncInProgress(Exception):
+    pass
+
+
+def _lock_owner():
+    return f"{socket.gethostname()} {os.getpid()}"
+
+
+def _read_lock():
+    try:
+        with open(LOCK_FILE) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _is_stale(owner):
+    """Whether the lock held by ``owner`` ("host pid") was left by a sync that is gone.
+
+    On this host the pid tells; a lock of another host is stale once the
+    sync stopped touching it (see ``touch_lock``).
+    """
+    host, _, pid = owner.partition(" ")
+    if host != socket.gethostname() or not pid.isdigit():
+        try:
+            return time.time() - os.path.getmtime(LOCK_FILE) > LOCK_STALE_SECONDS
+        except FileNotFoundError:
+            return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def touch_lock():
+    """Show that the sync holding the lock is still alive."""
+    try:
+        os.utime(LOCK_FILE)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def sync_lock():
+    """Let only one sync run at a time across processes (web workers, daemon, CLI).
+
+    The lock file holds the host and pid of its owner and is only removed by
+    that owner, or by the next sync once the owner is gone.
+    """
+    owner = _read_lock()
+    if owner is not None and _is_stale(owner) and _read_lock() == owner:
+        try:
+            os.remove(LOCK_FILE)
+        except FileNotFoundError:
+            pass
+    me = _lock_owner()
+    try:
+        fd = os.open(LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        raise SyncInProgress("Une synchro est déjà en cours")
+    try:
+        os.write(fd, me.encode())
+        os.close(fd)
+        yield
+    finally:
+        if _read_lock() == me:
+            try:
+                os.remove(LOCK_FILE)
+            except FileNotFoundError:
+                pass
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {"lists": {}, "syncs_since_reconcile": 0}
+    with open(STATE_FILE) as f:
+        return json.load(f)
+
+
+def save_state(state, path=None):
+    path = path or STATE_FILE
+    with atomic_path(path) as tmp, open(tmp, "w") as f:
+        json.dump(state, f)
+
+
+def load_status():
+    """Progress and outcome of the latest sync, whoever runs it (dashboard, daemon or CLI)."""
+    if not os.path.exists(STATUS_FILE):
+        return {}
+    try:
+        with open(STATUS_FILE) as f:
+            status = json.load(f)
+    except ValueError:
+        return {}
+    # A crashed sync leaves "running" set, with no lock or a stale one
+    if status.get("running"):
+        owner = _read_lock()
+        if owner is None or _is_stale(owner):
+            status["running"] = False
+    return status
+
+
+def record_status(**fields):
+    status = load_status()
+    status.update(fields)
+    save_state(status, STATUS_FILE)
+
+
+def merge_rows(df, rows, removed_ids):
+    """Upsert ``rows`` (a DataFrame) by task_id and drop ``removed_ids``; existing rows keep their position."""
+    columns = df.columns
+    df = df[~df["task_id"].isin(removed_ids)]
+    if rows.empty:
+        return df.reset_index(drop=True)
+    changed = to_typed(rows.reindex(columns=df.columns))
+    changed = changed.drop_duplicates("task_id", keep="last").set_index("task_id")
+    df = df.set_index("task_id")
+    common = changed.index.intersection(df.index)
+    df.loc[common, changed.columns] = changed.loc[common]
+    added = changed[~changed.index.isin(df.index)]
+    return pd.concat([df, added]).reset_index()[columns]
+
+
+def sync_tasks(full=False, reconcile_every=RECONCILE_EVERY, concurrency=DEFAULT_CONCURRENCY, timings=None,
+               progress=None, metrics=None):
+    """Bring the local dataset up to date with ClickUp.
+
+    Each list keeps a high-water mark of the largest ``date_updated`` seen and
+    the ids of the tasks it held. An incremental run only asks for tasks
+    updated after that mark and upserts them by task_id, which also handles
+    tasks moved to another list. Tasks of lists that no longer exist are
+    dropped. Lists without a mark, a ``full`` run, and the periodic reconcile
+    pass fetch everything, and ids that are no longer returned are deleted.
+    The rollup index of the summary views is updated for the lists that changed.
+    Progress and outcome go to the status file (see ``locked_sync``).
+    Raises SyncInProgress when another process is already syncing.
+    """
+    return locked_sync(lambda report: _sync_tasks(full, reconcile_every, concurrency, timings, report, metrics),
+                       progress)
+
+
+def locked_sync(job, progress=None):
+    """Run ``job(report)`` under the sync lock and record it in the status file.
+
+    ``job`` calls ``report(done, total)`` as lists finish and returns the
+    summary of the sync. Progress (``running``, ``done``, ``total`` lists)
+    and outcome go to the status file, so every process can report the sync
+    in course; ``progress`` is called too when given.
+    """
+    with sync_lock():
+        started = time.time()
+        record_status(running=True, done=0, total=0, started=started)
+        last_write = [0.0]
+
+        def report(done, total):
+            if done == 0 or done == total or time.time() - last_write[0] >= PROGRESS_EVERY:
+                record_status(done=done, total=total)
+                touch_lock()
+                last_write[0] = time.time()
+            if progress:
+                progress(done, total)
+
+        try:
+            summary = job(report)
+        except Exception as e:
+            record_status(running=False, last_attempt=started, last_error=str(e))
+            raise
+        record_status(running=False, last_attempt=started, last_synced=time.time(), last_error=None,
+                      summary=summary)
+        return summary
+
+
+def _sync_tasks(full, reconcile_every, concurrency, timings, progress, metrics):
+    state = load_state()
+    if not os.path.exists(store_path()):
+        full = True
+    reconcile = full or state.get("syncs_since_reconcile", 0) + 1 >= reconcile_every
+    known = {} if full else state.get("lists", {})
+
+    def params_for(list_id):
+        mark = known.get(list_id, {}).get("date_updated")
+        if reconcile or mark is None:
+            return TASK_PARAMS
+        return {**TASK_PARAMS, "date_updated_gt": mark}
+
+    # Full and reconcile passes also revalidate the cached hierarchy
+    crawled = crawl_workspace(params_for, concurrency=concurrency, timings=timings, progress=progress,
+                              metrics=metrics, refresh_hierarchy=reconcile)
+
+    fetched_ids = set()
+    for *_, tasks in crawled:
+        fetched_ids.update(task["id"] for task in tasks)
+
+    rows = TaskColumns()
+    lists = {}
+    removed_ids = set()
+    for team_name, space_name, folder_name, lst, tasks in crawled:
+        previous = known.get(lst["id"], {})
+        previous_ids = set(previous.get("task_ids", []))
+        fetched_here = {task["id"] for task in tasks}
+        if reconcile or "date_updated" not in previous:
+            removed_ids.update(previous_ids - fetched_here)
+            task_ids = fetched_here
+        else:
+            # Ids fetched elsewhere were moved out of this list
+            task_ids = (previous_ids - fetched_ids) | fetched_here
+        marks = [int(task["date_updated"]) for task in tasks if task.get("date_updated")]
+        if previous.get("date_updated"):
+            marks.append(int(previous["date_updated"]))
+        lists[lst["id"]] = {
+            "date_updated": str(max(marks)) if marks else None,
+            "task_ids": sorted(task_ids),
+        }
+        rows.add(tasks, team_name, space_name, folder_name, lst["name"])
+
+    for list_id, entry in known.items():
+        if list_id not in lists:
+            removed_ids.update(entry.get("task_ids", []))
+    for entry in lists.values():
+        removed_ids.difference_update(entry["task_ids"])
+
+    rows = rows.to_frame()
+    if reconcile:
+        df = rows
+        rollups = build_rollups(df)
+    else:
+        previous = load_tasks()
+        df = merge_rows(previous, rows, removed_ids)
+        rollups = update_rollups(load_rollups(), previous, df, set(rows["task_id"]), removed_ids)
+    # The index goes first: a reader that sees the new tasks finds the index matching them
+    save_rollups(rollups)
+    save_tasks(df)
+    if SHARED_DATASET:
+        publish_dataset(df)
+
+    state = {
+        "lists": lists,
+        "syncs_since_reconcile": 0 if reconcile else state.get("syncs_since_reconcile", 0) + 1,
+    }
+    save_state(state)
+    return {
+        "mode": "full" if full else "reconcile" if reconcile else "incremental",
+        "updated": len(rows),
+        "removed": len(removed_ids),
+        "total": len(df),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="re-télécharger toutes les tâches")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    timings = {}
+    metrics = {}
+    try:
+        summary = sync_tasks(full=args.full, concurrency=args.concurrency, timings=timings, metrics=metrics)
+    except SyncInProgress as e:
+        print(f"⏸️ {e}")
+        sys.exit(1)
+    print(f"\n✅ Synchro {summary['mode']} : {summary['updated']} tâches mises à jour, "
+          f"{summary['removed']} supprimées, {summary['total']} au total")
+    print_timings(timings)
+    print_metrics(metrics)
+    print(f"\n📁 Fichier mis à jour : {store_path()}")
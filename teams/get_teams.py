@@ -1,20 +1,24 @@
 import sys
 import os
-import requests
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from auth.oauth_handler import get_access_token
+from auth.oauth_handler import token_manager
+from api.client import ClickUpAPIError, ClickUpClient
+from api.hierarchy import HierarchyCache
 
 def get_teams():
-    token = get_access_token()
-    headers = {"Authorization": token}
-    url = "https://api.clickup.com/api/v2/team"
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        print(f"❌ Erreur API ({response.status_code}) : {response.text}")
+    client = ClickUpClient(token_manager)
+    hierarchy = HierarchyCache()
+    try:
+        teams = hierarchy.fetch(client, "/team", "teams")
+        hierarchy.save()
+        return teams
+    except ClickUpAPIError as e:
+        print(f"❌ Erreur API ({e.status_code}) : {e.text}")
         return []
-    return response.json().get("teams", [])
+    finally:
+        client.close()
 
 if __name__ == "__main__":
     teams = get_teams()
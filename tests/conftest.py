@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Tokens, hierarchy cache and sync files of the tests never touch data/
+os.environ["CLICKUP_DATA_DIR"] = tempfile.mkdtemp(prefix="clickup-tests-")
+os.environ.pop("TIMELINE_SHARED_DATASET", None)
@@ -0,0 +1,281 @@
+import sys
+import os
+import json
+import time
+import functools
+import pytest
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import api.client as client_module
+import tasks.crawler as crawler
+import tasks.sync_tasks as sync
+from api.client import ClickUpAPIError, ClickUpClient, RateLimiter
+from api.hierarchy import HierarchyCache
+from benchmarks.fake_clickup import FakeClickUp
+from tasks.get_all_tasks_with_subtasks import TASK_PARAMS, stream_all_tasks_with_subtasks
+from tasks.pagination import iter_list_tasks
+from tasks.sync_tasks import merge_rows
+from storage.task_store import load_tasks, to_typed
+
+
+def response(status, body=None, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = json.dumps(body or {}).encode()
+    r.headers.update(headers or {})
+    return r
+
+
+class StubSession:
+    """Answers the queued responses in order and keeps the headers of each request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        self.sent.append(headers)
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+class StubTokens:
+    def __init__(self):
+        self.current = "old-token"
+        self.renewals = []
+
+    def token(self):
+        return self.current
+
+    def renew(self, rejected=None):
+        self.renewals.append(rejected)
+        self.current = "new-token"
+        return self.current
+
+
+def stub_client(*responses, token="token"):
+    client = ClickUpClient(token, limiter=RateLimiter(limit=1_000_000))
+    client.session = StubSession(*responses)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(client_module, "BACKOFF_BASE", 0.001)
+
+
+def test_429_waits_for_the_reset_then_succeeds():
+    with FakeClickUp(10, lists=1, rate_limit=2, rate_window=1.0) as fake:
+        # Another client has used the window: this one only learns it from the 429
+        other = ClickUpClient("token", limiter=RateLimiter(limit=1_000_000))
+        other.get(f"{fake.url}/team")
+        other.get(f"{fake.url}/team")
+        client = ClickUpClient("token", limiter=RateLimiter(limit=1_000_000))
+        start = time.monotonic()
+        body = client.get(f"{fake.url}/team")
+        elapsed = time.monotonic() - start
+
+    assert body["teams"][0]["id"] == "T0"
+    assert client.metrics["throttled"] == 1
+    assert client.metrics["throttled_seconds"] > 0
+    assert fake.throttled == 1
+    assert elapsed < 2.0
+
+
+def test_server_errors_are_retried():
+    client = stub_client(response(503), response(502), response(200, {"ok": True}))
+    assert client.get("/team") == {"ok": True}
+    assert client.metrics["retries"] == 2
+    assert client.metrics["requests"] == 3
+
+
+def test_client_errors_are_not_retried():
+    client = stub_client(response(404, {"err": "not found"}), response(200))
+    with pytest.raises(ClickUpAPIError) as error:
+        client.get("/list/1/task")
+    assert error.value.status_code == 404
+    assert client.metrics["requests"] == 1
+
+
+def test_401_renews_the_token_once():
+    tokens = StubTokens()
+    client = stub_client(response(401), response(200, {"ok": True}), token=tokens)
+    assert client.get("/team") == {"ok": True}
+    assert tokens.renewals == ["old-token"]
+    assert [headers["Authorization"] for headers in client.session.sent] == ["old-token", "new-token"]
+
+    tokens = StubTokens()
+    client = stub_client(response(401), response(401), response(200), token=tokens)
+    with pytest.raises(ClickUpAPIError) as error:
+        client.get("/team")
+    assert error.value.status_code == 401
+    assert len(tokens.renewals) == 1
+
+
+def sequential_crawl(url):
+    # The order of the original crawl: team → space → folder → list, then the folderless lists
+    client = ClickUpClient("token", limiter=RateLimiter(limit=1_000_000))
+    folder_lists, folderless = [], []
+    for team in client.get(f"{url}/team")["teams"]:
+        for space in client.get(f"{url}/team/{team['id']}/space")["spaces"]:
+            for folder in client.get(f"{url}/space/{space['id']}/folder")["folders"]:
+                for lst in client.get(f"{url}/folder/{folder['id']}/list")["lists"]:
+                    folder_lists.append((team["name"], space["name"], folder["name"], lst))
+            for lst in client.get(f"{url}/space/{space['id']}/list")["lists"]:
+                folderless.append((team["name"], space["name"], crawler.FOLDERLESS, lst))
+    rows = []
+    for team_name, space_name, folder_name, lst in folder_lists + folderless:
+        for task in iter_list_tasks(client, lst["id"], TASK_PARAMS):
+            rows.append((task["id"], lst["name"], folder_name, space_name, team_name))
+    return rows
+
+
+@pytest.fixture
+def fake_workspace(tmp_path, monkeypatch):
+    with FakeClickUp(2_500, lists=12, folders=2, teams=2, spaces=2, folderless=1) as fake:
+        monkeypatch.setattr(client_module, "API_URL", fake.url)
+        monkeypatch.setattr(crawler, "ClickUpClient", lambda token, pool_size=10: ClickUpClient(
+            "token", pool_size=pool_size, limiter=RateLimiter(limit=1_000_000)))
+        monkeypatch.setattr(crawler, "HierarchyCache", functools.partial(
+            HierarchyCache, path=str(tmp_path / "hierarchy.json")))
+        yield fake
+
+
+def test_concurrent_crawl_keeps_the_sequential_order(fake_workspace, tmp_path):
+    expected = sequential_crawl(fake_workspace.url)
+
+    crawled = crawler.crawl_workspace(TASK_PARAMS, concurrency=8)
+    rows = [
+        (task["id"], lst["name"], folder_name, space_name, team_name)
+        for team_name, space_name, folder_name, lst, tasks in crawled
+        for task in tasks
+    ]
+    assert len(expected) == 2_500
+    assert rows == expected
+
+    client = ClickUpClient("token", limiter=RateLimiter(limit=1_000_000))
+    hierarchy = HierarchyCache(path=str(tmp_path / "stream_hierarchy.json"))
+    path, count = stream_all_tasks_with_subtasks(path=str(tmp_path / "tasks.parquet"), fmt="parquet",
+                                                 concurrency=8, client=client, hierarchy=hierarchy)
+    streamed = load_tasks(fmt="parquet", path=path)
+    assert count == 2_500
+    assert list(zip(streamed["task_id"], streamed["list"], streamed["folder"], streamed["space"],
+                    streamed["team"])) == expected
+
+
+class Workspace:
+    """In-memory ClickUp answering the list task endpoint with ``date_updated_gt``."""
+
+    def __init__(self):
+        self.lists = {}
+
+    def task(self, list_id, task_id, updated, name=None):
+        self.lists.setdefault(list_id, {})[task_id] = {
+            "id": task_id, "name": name or task_id, "date_updated": str(updated),
+            "status": {"status": "to do"}, "start_date": "1704067200000", "due_date": "1704672000000",
+        }
+
+    def remove(self, list_id, task_id):
+        del self.lists[list_id][task_id]
+
+    def client(self, *args, **kwargs):
+        workspace = self
+
+        class Client:
+            metrics = {}
+
+            def get_if_changed(self, path, etag=None):
+                if path == "/team":
+                    return {"teams": [{"id": "T", "name": "Équipe"}]}, None
+                if path.endswith("/space"):
+                    return {"spaces": [{"id": "S", "name": "Espace"}]}, None
+                if path.endswith("/folder"):
+                    return {"folders": []}, None
+                return {"lists": [{"id": list_id, "name": list_id} for list_id in workspace.lists]}, None
+
+            def get(self, path, params=None):
+                list_id = path.split("/")[2]
+                if list_id not in workspace.lists:
+                    raise ClickUpAPIError(404, "List not found", path)
+                after = int((params or {}).get("date_updated_gt", -1))
+                tasks = [task for task in workspace.lists[list_id].values() if int(task["date_updated"]) > after]
+                return {"tasks": tasks, "last_page": True}
+
+            def close(self):
+                pass
+
+        return Client()
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ["STATE_FILE", "STATUS_FILE", "LOCK_FILE"]:
+        monkeypatch.setattr(sync, name, str(tmp_path / os.path.basename(getattr(sync, name))))
+    monkeypatch.setattr(sync, "SHARED_DATASET", False)
+    monkeypatch.setattr(crawler, "HierarchyCache", functools.partial(
+        HierarchyCache, path=str(tmp_path / "hierarchy.json")))
+    workspace = Workspace()
+    monkeypatch.setattr(crawler, "ClickUpClient", workspace.client)
+    return workspace
+
+
+def stored():
+    df = load_tasks()
+    return list(zip(df["task_id"], df["task_name"], df["list"]))
+
+
+def test_incremental_sync_upserts_moves_and_deletes(workspace):
+    workspace.task("A", "a1", 1)
+    workspace.task("A", "a2", 1)
+    workspace.task("B", "b1", 1)
+    workspace.task("C", "c1", 1)
+    assert sync.sync_tasks(full=True, reconcile_every=100)["mode"] == "full"
+    assert stored() == [("a1", "a1", "A"), ("a2", "a2", "A"), ("b1", "b1", "B"), ("c1", "c1", "C")]
+
+    # a1 renamed, b1 moved to A, a3 created, list C deleted
+    workspace.task("A", "a1", 2, name="a1 renommée")
+    workspace.remove("B", "b1")
+    workspace.task("A", "b1", 2)
+    workspace.task("A", "a3", 2)
+    del workspace.lists["C"]
+    summary = sync.sync_tasks(reconcile_every=100)
+    assert summary["mode"] == "incremental"
+    assert summary["removed"] == 1
+    # Updated rows keep their position, new ones are appended
+    assert stored() == [("a1", "a1 renommée", "A"), ("a2", "a2", "A"), ("b1", "b1", "A"), ("a3", "a3", "A")]
+    assert sync.load_state()["lists"]["A"]["date_updated"] == "2"
+    assert sync.load_state()["lists"]["B"]["task_ids"] == []
+
+    # A deleted task never comes back in a date_updated_gt query: the reconcile pass drops it
+    workspace.remove("A", "a2")
+    assert sync.sync_tasks(reconcile_every=100)["removed"] == 0
+    assert "a2" in [task_id for task_id, *_ in stored()]
+    summary = sync.sync_tasks(reconcile_every=1)
+    assert summary["mode"] == "reconcile"
+    assert [task_id for task_id, *_ in stored()] == ["a1", "b1", "a3"]
+
+    status = sync.load_status()
+    assert status["running"] is False and status["last_error"] is None
+    assert not os.path.exists(sync.LOCK_FILE)
+
+
+def test_sync_refuses_to_run_twice(workspace):
+    workspace.task("A", "a1", 1)
+    with sync.sync_lock():
+        with pytest.raises(sync.SyncInProgress):
+            sync.sync_tasks()
+
+
+def test_merge_rows_upserts_in_place_and_drops_removed():
+    import pandas as pd
+    previous = to_typed(pd.DataFrame({"task_id": ["1", "2", "3"], "task_name": ["un", "deux", "trois"],
+                                      "list": ["A", "A", "B"]}))
+    rows = pd.DataFrame({"task_id": ["4", "2"], "task_name": ["quatre", "deux bis"], "list": ["B", "B"]})
+    merged = merge_rows(previous, rows, removed_ids={"3"})
+    assert list(merged["task_id"]) == ["1", "2", "4"]
+    assert list(merged["task_name"]) == ["un", "deux bis", "quatre"]
+    assert list(merged["list"]) == ["A", "B", "B"]
@@ -0,0 +1,73 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.synthetic import make_tasks
+from storage.task_model import timeline_tasks
+from timeline.rows import build_timeline_data
+
+STATUS = {
+    "to do": "📝", "selected for development": "🚦", "in progress": "⏳",
+    "on hold": "⏸️", "review": "🔍", "done": "🆗", "complete": "🎉",
+}
+PRIORITY = {"urgent": "🔴", "high": "🟠", "normal": "🔵", "low": "⚪"}
+
+
+def initials(assignees):
+    if not assignees:
+        return "NA"
+    return ", ".join("".join(p[0].upper() for p in a.strip().split()[:2]) for a in assignees.split(",") if a.strip())
+
+
+def row(task, y_label):
+    label = task["task_name"]
+    return {
+        "y_label": y_label, "start": task["start_date"], "end": task["due_date"], "Project 📁 ": task["list"],
+        "assignee": task["assignee"], "priority": task["priority"], "status": task["status"],
+        "label": label, "textposition": "inside" if len(label) <= 25 else "outside",
+    }
+
+
+def loop_rows(df, view_mode):
+    """The rows as the original per-list, per-task loop built them."""
+    rows = []
+    for list_name in df["list"].unique():
+        group = df[df["list"] == list_name]
+        if view_mode == "Project 📁 ":
+            rows.append({"y_label": f"📦 {list_name}", "start": group["start_date"].min(),
+                         "end": group["due_date"].max(), "Project 📁 ": list_name})
+        for _, task in group[group["type"] == "task"].sort_values("start_date").iterrows():
+            prefix = f"{initials(task['assignee'])} | {STATUS.get(task['status'].lower(), '')} | " \
+                     f"{PRIORITY.get(task['priority'].lower(), '')}"
+            if view_mode in ["task", "detailed"]:
+                rows.append(row(task, f"{prefix} | <span style='color:rgba(0,0,0,0.15)'>{task['task_id']}</span>"))
+            if view_mode == "detailed":
+                subtasks = group[(group["type"] == "subtask") & (group["parent_id"] == task["task_id"])]
+                for _, sub in subtasks.sort_values("start_date").iterrows():
+                    sub_prefix = f"{initials(sub['assignee'])} | {STATUS.get(sub['status'].lower(), '')} | " \
+                                 f"{PRIORITY.get(sub['priority'].lower(), '')}"
+                    rows.append(row(sub, f"{sub_prefix} | {sub['task_id']}"))
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def tasks():
+    df = make_tasks(3_000, seed=3)
+    # Distinct start dates: the loop sorted with an unstable sort, so the order of ties was never defined
+    df["start_date"] = df["start_date"] + pd.to_timedelta(np.arange(len(df)), "s")
+    return df
+
+
+@pytest.mark.parametrize("view_mode", ["task", "detailed", "Project 📁 "])
+@pytest.mark.parametrize("model", [False, True])
+def test_rows_match_the_original_loop(tasks, view_mode, model):
+    df = timeline_tasks(tasks) if model else tasks
+    expected = loop_rows(df, view_mode)
+    rows = build_timeline_data(df, view_mode).reset_index(drop=True)
+    # Summary rows carry rollup counts since the rollup index: compare what the loop defined
+    columns = list(expected.columns)
+    assert len(rows) == len(expected)
+    pd.testing.assert_frame_equal(rows[columns].astype(str), expected.astype(str))
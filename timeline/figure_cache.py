@@ -0,0 +1,70 @@
+import os
+import threading
+import datetime as dt
+from collections import OrderedDict
+
+from monitoring.metrics import record
+
+FIGURE_CACHE_SIZE = int(os.getenv("FIGURE_CACHE_SIZE", "32"))
+
+
+def figure_key(version, granularity, view_mode, assignees=None, priorities=None, statuses=None, window=None,
+               page=0):
+    """Cache key of one figure: dataset version, today's date and every callback input.
+
+    Filters are sorted so the order values were picked in does not matter.
+    The date is part of the key because the figure draws a "today" line.
+    ``window`` is the visible x range, already rounded to whole days, and
+    ``page`` the page of rows shown.
+    """
+    return (
+        version,
+        dt.date.today(),
+        granularity,
+        view_mode,
+        tuple(sorted(assignees or [])),
+        tuple(sorted(priorities or [])),
+        tuple(sorted(statuses or [])),
+        tuple(window or []),
+        page,
+    )
+
+
+class FigureCache:
+    """Bounded LRU of built figures, shared by every thread of a Dash worker.
+
+    Entries of an older dataset version are dropped as soon as a key with
+    another version is seen, so a Refresh invalidates the whole cache. Hits
+    and misses are counted in ``timeline_figure_cache_{hits,misses}_total``.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key[0] != self._version:
+                self._entries.clear()
+                self._version = key[0]
+            if key in self._entries:
+                record("figure_cache_hits", 1)
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            record("figure_cache_misses", 1)
+
+        # Built outside the lock so a slow figure does not block cache hits
+        value = build()
+        with self._lock:
+            if key[0] == self._version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from storage.task_model import assignee_table
+from timeline.rows import timeline_order
+
+# Filter sets whose ordered rows are kept per dataset version
+VISIBLE_CACHE_SIZE = 16
+
+
+def split_assignees(assignee):
+    """Explode the comma-separated ``assignee`` column into (row position, name) pairs."""
+    table = assignee_table(assignee)
+    return table["row"].to_numpy(), table["assignee"].to_numpy()
+
+
+def dropdown_options(values):
+    """Options of a filter dropdown: every name in ``values``, comma-separated lists split."""
+    names = {name.strip() for value in values.dropna().unique() for name in str(value).split(",")}
+    names.discard("")
+    return [{"label": name, "value": name} for name in sorted(names)]
+
+
+class TaskIndex:
+    """Lookup tables over one version of the task table, built once.
+
+    Assignees map to the row positions they appear in, and status and
+    priority are stored as integer codes, so a filter is a few NumPy
+    operations instead of a pass of Python over every row. The timeline
+    ordering of each view mode, and of the last filter sets, is memoized here too.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self.size = len(df)
+        rows, names = split_assignees(df["assignee"])
+        groups = pd.Series(rows).groupby(names).indices
+        self.assignee_rows = {name: rows[positions] for name, positions in groups.items()}
+        self.status_codes, self.status_values = pd.factorize(df["status"])
+        self.priority_codes, self.priority_values = pd.factorize(df["priority"])
+        self._orders = {}
+        self._visible = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _codes_mask(self, codes, values, selected):
+        wanted = [values.get_loc(value) for value in selected if value in values]
+        return np.isin(codes, wanted)
+
+    def mask(self, assignees=None, priorities=None, statuses=None):
+        """Boolean array of the rows matching every given filter, or None when no filter is set."""
+        if not (assignees or priorities or statuses):
+            return None
+        mask = np.ones(self.size, dtype=bool)
+        if assignees:
+            selected = np.zeros(self.size, dtype=bool)
+            for name in assignees:
+                selected[self.assignee_rows.get(name, [])] = True
+            mask &= selected
+        if priorities:
+            mask &= self._codes_mask(self.priority_codes, self.priority_values, priorities)
+        if statuses:
+            mask &= self._codes_mask(self.status_codes, self.status_values, statuses)
+        return mask
+
+    def order(self, view_mode):
+        if view_mode not in ["task", "detailed"]:
+            return None
+        if view_mode not in self._orders:
+            self._orders[view_mode] = timeline_order(self._df, view_mode)
+        return self._orders[view_mode]
+
+    def visible(self, view_mode, mask, key):
+        """``order(view_mode)`` restricted to the rows of ``mask``, memoized under ``key``.
+
+        ``key`` must identify the mask (filters and visible window), so paging
+        through the rows reuses the same ordering. Nothing is kept without a key.
+        """
+        cache_key = (view_mode, key)
+        with self._lock:
+            if key is not None and cache_key in self._visible:
+                self._visible.move_to_end(cache_key)
+                return self._visible[cache_key]
+        positions, is_task = self.order(view_mode)
+        if mask is not None:
+            keep = mask[positions]
+            positions, is_task = positions[keep], is_task[keep]
+        if key is not None:
+            with self._lock:
+                self._visible[cache_key] = (positions, is_task)
+                while len(self._visible) > VISIBLE_CACHE_SIZE:
+                    self._visible.popitem(last=False)
+        return positions, is_task
+
+
+_index_lock = threading.Lock()
+_index_entry = (None, None)
+
+
+def get_task_index(version, df):
+    """Return the TaskIndex of ``df``, rebuilt only when the dataset version changes."""
+    global _index_entry
+    with _index_lock:
+        if _index_entry[0] != version or _index_entry[1] is None:
+            _index_entry = (version, TaskIndex(df))
+        return _index_entry[1]
+
@@ -0,0 +1,57 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+STATUS_ICONS = {
+    "to do": "📝", "selected for development": "🚦", "in progress": "⏳",
+    "on hold": "⏸️", "review": "🔍", "done": "🆗", "complete": "🎉",
+}
+PRIORITY_ICONS = {
+    "urgent": "🔴", "high": "🟠", "normal": "🔵", "low": "⚪",
+}
+
+
+@lru_cache(maxsize=65536)
+def _initials(assignees):
+    return ", ".join(["".join([p[0].upper() for p in a.strip().split()[:2]]) for a in assignees.split(",") if a.strip()])
+
+
+def initials(assignees):
+    if not isinstance(assignees, str) or not assignees:
+        return "NA"
+    return _initials(assignees)
+
+
+def _per_unique(values, func):
+    # One Python call per distinct value, then a take over the codes
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.array([func(value) for value in uniques], dtype=object)[codes]
+
+
+def initials_column(assignee):
+    return _per_unique(assignee, initials)
+
+
+def icon_column(values, icons):
+    """The icon of each value (matched lower case), "" when it has none."""
+    return _per_unique(values, lambda value: icons.get(str(value).lower(), ""))
+
+
+def with_icon_column(values, icons):
+    return _per_unique(values, lambda value: f"{icons.get(str(value).lower(), '')} {value}")
+
+
+def date_column(values):
+    return pd.Series(values).dt.strftime("%Y-%m-%d").fillna("").to_numpy(dtype=object)
+
+
+def format_hover(data):
+    """Add the hover and label columns of the figure to timeline rows, a column at a time."""
+    return data.assign(**{
+        "status": with_icon_column(data["status"], STATUS_ICONS),
+        "priority": with_icon_column(data["priority"], PRIORITY_ICONS),
+        "assignee": initials_column(data["assignee"]),
+        "start date": date_column(data["start"]),
+        "due date": date_column(data["end"]),
+        "task_name": "📝 " + data["label"],
+    })
@@ -0,0 +1,157 @@
+import os
+import numpy as np
+import pandas as pd
+
+from timeline.filters import split_assignees
+from timeline.rows import ROW_COLUMNS, build_timeline_data
+
+# Most bars a figure may hold, whatever the dataset size
+MAX_BARS = int(os.getenv("TIMELINE_MAX_BARS", "400"))
+# y-axis rows per page once tasks are shown one by one
+PAGE_ROWS = int(os.getenv("TIMELINE_PAGE_ROWS", "50"))
+
+GRANULARITIES = ["daily", "weekly", "monthly", "quarterly", "yearly"]
+PERIODS = {"daily": "D", "weekly": "W", "monthly": "M", "quarterly": "Q", "yearly": "Y"}
+OTHERS = "Autres"
+
+
+def visible_window(relayout):
+    """Read the x range out of a ``relayoutData`` event.
+
+    Returns ``[start, end]`` as ISO dates widened to whole days, ``"reset"``
+    when the axis went back to autorange, and None when the event does not
+    touch the x axis (autosize, y zoom...).
+    """
+    if not relayout:
+        return None
+    if relayout.get("xaxis.autorange"):
+        return "reset"
+    bounds = relayout.get("xaxis.range") or [relayout.get("xaxis.range[0]"), relayout.get("xaxis.range[1]")]
+    if bounds[0] is None or bounds[1] is None:
+        return None
+    start, end = sorted(pd.Timestamp(bound) for bound in bounds)
+    return [start.floor("D").isoformat(), end.ceil("D").isoformat()]
+
+
+def window_mask(df, window, mask=None):
+    """Rows of ``df`` overlapping ``window``, combined with ``mask``."""
+    if not window:
+        return mask
+    start, end = pd.Timestamp(window[0]), pd.Timestamp(window[1])
+    inside = ((df["start_date"] <= end) & (df["due_date"] >= start)).to_numpy()
+    return inside if mask is None else mask & inside
+
+
+def _groups(df, by):
+    # (row position, group name) pairs, groups in display order
+    if by == "assignee":
+        rows, names = split_assignees(df["assignee"])
+        return rows, names, sorted(set(names))
+    codes, names = pd.factorize(df["list"])
+    return np.arange(len(df)), np.asarray(names)[codes], list(names)
+
+
+def _active_counts(group_codes, first, last, n_groups):
+    # Tasks active in each (group, period): +1 where a task starts, -1 after it ends
+    n_periods = last.max() + 2
+    counts = np.zeros((n_groups, n_periods), dtype=np.int64)
+    np.add.at(counts, (group_codes, first), 1)
+    np.add.at(counts, (group_codes, last + 1), -1)
+    return counts.cumsum(axis=1)[:, :-1]
+
+
+def aggregate_rows(df, by, granularity, mask=None, window=None, max_bars=MAX_BARS):
+    """Collapse the selected rows of ``df`` into at most ``max_bars`` aggregate bars.
+
+    Rows are grouped by project (``by="list"``) or by assignee, and each group
+    gets one bar per period of ``granularity`` holding the number of tasks
+    active in it. When that is still too many bars the period is widened
+    (week, month... up to a single bar per group), and beyond ``max_bars - 1``
+    groups the smallest ones are merged into "Autres". Returns rows with the
+    ``ROW_COLUMNS`` of ``build_timeline_data``.
+    """
+    rows, names, order = _groups(df, by)
+    if mask is not None:
+        keep = mask[rows]
+        rows, names = rows[keep], names[keep]
+    if not len(rows):
+        return pd.DataFrame(columns=ROW_COLUMNS)
+
+    start = df["start_date"].to_numpy()[rows]
+    end = df["due_date"].to_numpy()[rows]
+    if window:
+        start = np.maximum(start, np.datetime64(pd.Timestamp(window[0])))
+        end = np.minimum(end, np.datetime64(pd.Timestamp(window[1])))
+    end = np.maximum(start, end)
+
+    sizes = pd.Series(names).value_counts()
+    if len(sizes) > max_bars:
+        small = set(sizes.index[max_bars - 1:])
+        names = np.where(np.isin(names, list(small)), OTHERS, names)
+        order = [name for name in order if name not in small] + [OTHERS]
+    present = set(names)
+    order = [name for name in order if name in present]
+    group_codes = pd.Categorical(names, categories=order).codes
+
+    for level in GRANULARITIES[GRANULARITIES.index(granularity) if granularity in PERIODS else 2:]:
+        freq = PERIODS[level]
+        first = pd.PeriodIndex(pd.DatetimeIndex(start), freq=freq).asi8
+        last = pd.PeriodIndex(pd.DatetimeIndex(end), freq=freq).asi8
+        base = first.min()
+        # The count matrix is only worth building when it could fit the budget
+        if len(order) * (last.max() - base + 1) > 50 * max_bars:
+            continue
+        counts = _active_counts(group_codes, first - base, last - base, len(order))
+        cells = np.nonzero(counts)
+        if len(cells[0]) <= max_bars:
+            periods = pd.PeriodIndex.from_ordinals(cells[1] + base, freq=freq)
+            bar_start = np.maximum(periods.start_time.to_numpy(), start.min())
+            bar_end = np.minimum(periods.end_time.to_numpy(), end.max())
+            return _aggregate_frame(by, np.asarray(order)[cells[0]], bar_start, bar_end, counts[cells])
+
+    # Even yearly bars do not fit: one bar per group over its whole span
+    spans = pd.DataFrame({"group": group_codes, "start": start, "end": end}).groupby("group").agg(
+        start=("start", "min"), end=("end", "max"), count=("start", "size"))
+    return _aggregate_frame(by, np.asarray(order)[spans.index], spans["start"].to_numpy(),
+                            spans["end"].to_numpy(), spans["count"].to_numpy())
+
+
+def _aggregate_frame(by, groups, start, end, counts):
+    groups = pd.Series(groups, dtype=str)
+    return pd.DataFrame({
+        "y_label": ("🙍 " if by == "assignee" else "📦 ") + groups,
+        "start": start,
+        "end": end,
+        "Project 📁 ": groups,
+        "assignee": groups if by == "assignee" else "",
+        "priority": "", "status": "",
+        "label": pd.Series(counts).astype(str) + " tâches",
+        "textposition": "inside",
+    }, columns=ROW_COLUMNS)
+
+
+def timeline_rows(df, index, view_mode, granularity, mask=None, window=None, by="list", max_bars=MAX_BARS,
+                  key=None, page=0, page_rows=PAGE_ROWS, groups=None):
+    """Timeline rows for the visible ``window``, never more than ``max_bars``.
+
+    ``index`` is the TaskIndex of ``df`` and ``mask`` the filter selection.
+    The task and detailed views show the tasks overlapping the window one by
+    one, however many there are: they are split into pages of ``page_rows``
+    rows (at most ``max_bars``) and only ``page`` (from 0) is built. Their
+    ordering is memoized in ``index`` under ``key``, which must identify the
+    filters and the window. Summary views take ``groups``, the rollup summary
+    of their level, and are collapsed with ``aggregate_rows`` when they have
+    more than ``max_bars`` groups. Returns ``(rows, aggregated, pages)``.
+    """
+    mask = window_mask(df, window, mask)
+    if view_mode in ["task", "detailed"]:
+        positions, is_task = index.visible(view_mode, mask, key)
+        page_rows = min(page_rows, max_bars)
+        pages = max(1, -(-len(positions) // page_rows))
+        page = min(max(page, 0), pages - 1)
+        shown = slice(page * page_rows, (page + 1) * page_rows)
+        return build_timeline_data(df, view_mode, order=(positions[shown], is_task[shown])), False, pages
+    data = build_timeline_data(df, view_mode, mask=mask, groups=groups)
+    if len(data) <= max_bars:
+        return data, False, 1
+    return aggregate_rows(df, by, granularity, mask=mask, window=window, max_bars=max_bars), True, 1
@@ -0,0 +1,51 @@
+import threading
+import datetime as dt
+
+
+class RefreshManager:
+    """Run the sync in a background thread of this process, one at a time.
+
+    ``start`` returns immediately. The sync writes its progress and outcome
+    to the shared status file (``tasks.sync_tasks.record_status``), which is
+    what the dashboard polls, so every worker reports the same sync. ``job``
+    returns None when it joined a sync already running elsewhere; otherwise
+    ``on_done`` runs after it, still in the background thread, so the new
+    dataset can be loaded before anyone asks for it.
+    """
+
+    def __init__(self, job, on_done=None):
+        self._job = job
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name="clickup-refresh", daemon=True)
+            self._thread.start()
+        return True
+
+    def _run(self):
+        # Failures are recorded in the status file by the sync itself
+        try:
+            summary = self._job()
+        except Exception as e:
+            print(f"❌ Échec de l'actualisation : {e}", flush=True)
+            return
+        if summary is not None and self._on_done:
+            self._on_done()
+
+
+def describe(status):
+    if status.get("running"):
+        if status.get("total"):
+            return f"⏳ Synchro en cours : {status.get('done', 0)}/{status['total']} listes"
+        return "⏳ Synchro en cours : lecture des espaces…"
+    if status.get("last_error"):
+        return f"Erreur lors de l'actualisation : {status['last_error']}"
+    if status.get("last_synced"):
+        finished = dt.datetime.fromtimestamp(status["last_synced"]).strftime("%H:%M:%S")
+        return f"✅ Données actualisées à {finished}"
+    return ""
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from storage.rollups import task_summary
+from timeline.formatting import PRIORITY_ICONS, STATUS_ICONS, icon_column, initials_column
+
+ROW_COLUMNS = ["y_label", "start", "end", "Project 📁 ", "assignee", "priority", "status", "label", "textposition"]
+# View modes drawing one bar per group, and the rollup level they show
+SUMMARY_VIEWS = {"Project 📁 ": "list", "Space 🗂️ ": "space", "Assignee 🙍 ": "assignee"}
+# (y label icon, bar label icon) of each level
+SUMMARY_ICONS = {"list": ("📦 ", "📁 "), "space": ("🗂️ ", "🗂️ "), "assignee": ("🙍 ", "🙍 ")}
+
+
+def _first_rows(df, level):
+    # Rank of each group by its first row in ``df``; assignees all rank 0 and go by name
+    if level == "assignee":
+        return {}
+    names = pd.unique(df[level].dropna().astype(str))
+    return dict(zip(names, range(len(names))))
+
+
+def _summary_rows(df, level, mask=None, groups=None):
+    # ``groups`` is the rollup summary of the whole dataset. A filtered
+    # selection is added up again from its rows, but headers keep the order
+    # of the whole dataset.
+    if groups is None or mask is not None:
+        selected = task_summary(df if mask is None else df[mask], level)
+        if mask is not None:
+            order = _first_rows(df, level) if groups is None else dict(zip(groups["group"], groups["order"]))
+            selected["order"] = selected["group"].map(order).fillna(0)
+            selected = selected.sort_values(["order", "group"], kind="stable")
+        groups = selected
+    names = pd.Series(groups["group"].to_numpy(), dtype=str)
+    row_icon, label_icon = SUMMARY_ICONS[level]
+    return pd.DataFrame({
+        "y_label": row_icon + names,
+        "start": groups["start"].to_numpy(),
+        "end": groups["end"].to_numpy(),
+        "Project 📁 ": names,
+        "assignee": names if level == "assignee" else "",
+        "priority": "",
+        "status": (groups["tasks"].astype(str) + " tâches, " + groups["overdue"].astype(str) + " en retard").to_numpy(),
+        "label": label_icon + "<b>" + names + "</b>",
+        "textposition": "inside",
+    }, columns=ROW_COLUMNS)
+
+
+def timeline_order(df, view_mode):
+    """Return the row positions of ``df`` in timeline order, with a flag for tasks.
+
+    Lists keep their order of first appearance and tasks are sorted by start
+    date inside their list. In "detailed" mode each task is followed by the
+    subtasks of the same list whose ``parent_id`` is its ``task_id``, also by
+    start date. All sorts are stable, so ties keep the file order.
+    """
+    frame = pd.DataFrame({
+        "_list": pd.factorize(df["list"])[0],
+        "list": df["list"].to_numpy(),
+        "task_id": df["task_id"].to_numpy(),
+        "parent_id": df["parent_id"].to_numpy(),
+        "start_date": df["start_date"].to_numpy(),
+        "_row": np.arange(len(df)),
+    })
+    is_task = (df["type"] == "task").to_numpy()
+    tasks = frame[is_task].sort_values(["_list", "start_date"], kind="stable")
+    tasks = tasks.assign(_rank=np.arange(len(tasks)), _subtask=0)
+    if view_mode != "detailed":
+        return tasks["_row"].to_numpy(), np.ones(len(tasks), dtype=bool)
+
+    parents = tasks[["list", "task_id", "_rank"]].rename(columns={"task_id": "parent_id"})
+    subtasks = frame[(df["type"] == "subtask").to_numpy()].merge(parents, on=["list", "parent_id"], how="inner")
+    subtasks = subtasks.sort_values(["_rank", "start_date"], kind="stable").assign(_subtask=1)
+    items = pd.concat([tasks, subtasks], ignore_index=True).sort_values(["_rank", "_subtask"], kind="stable")
+    return items["_row"].to_numpy(), (items["_subtask"] == 0).to_numpy()
+
+
+def _item_rows(items, is_task):
+    prefix = pd.Series(
+        initials_column(items["assignee"])
+        + " | " + icon_column(items["status"], STATUS_ICONS)
+        + " | " + icon_column(items["priority"], PRIORITY_ICONS)
+    )
+    task_id = items["task_id"].astype(str)
+    has_id = items["task_id"].notna() & (task_id != "")
+    y_label = np.where(
+        ~is_task,
+        prefix + " | " + task_id,
+        np.where(has_id, prefix + " | <span style='color:rgba(0,0,0,0.15)'>" + task_id + "</span>", prefix),
+    )
+    label = items["task_name"]
+    return pd.DataFrame({
+        "y_label": y_label,
+        "start": items["start_date"].to_numpy(),
+        "end": items["due_date"].to_numpy(),
+        "Project 📁 ": items["list"].to_numpy(),
+        "assignee": items["assignee"].to_numpy(),
+        "priority": items["priority"].to_numpy(),
+        "status": items["status"].to_numpy(),
+        "label": label.to_numpy(),
+        "textposition": np.where(label.str.len() <= 25, "inside", "outside"),
+    }, columns=ROW_COLUMNS)
+
+
+def build_timeline_data(df, view_mode, mask=None, order=None, groups=None):
+    """Build the timeline rows of ``df`` for ``view_mode``.
+
+    ``mask`` is an optional boolean array over the rows of ``df`` selecting
+    what to show. The ordering is computed on the whole dataset (or taken from
+    ``order``, as returned by ``timeline_order``), so a subtask that matches a
+    filter keeps its place even when its parent does not, and labels are only
+    built for the selected rows. Summary views draw ``groups``, the rollup
+    summary of their level, without going over the tasks when nothing is filtered.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    if view_mode in SUMMARY_VIEWS:
+        return _summary_rows(df, SUMMARY_VIEWS[view_mode], mask, groups)
+    if view_mode not in ["task", "detailed"]:
+        return pd.DataFrame()
+    positions, is_task = order if order is not None else timeline_order(df, view_mode)
+    if mask is not None:
+        keep = mask[positions]
+        positions, is_task = positions[keep], is_task[keep]
+    if not len(positions):
+        return pd.DataFrame(columns=ROW_COLUMNS)
+    items = df.iloc[positions].reset_index(drop=True)
+    return _item_rows(items, is_task)
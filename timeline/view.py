@@ -0,0 +1,141 @@
+import threading
+import pandas as pd
+
+from storage.task_store import load_tasks, store_path
+from storage.dataset_cache import DatasetCache
+from storage.task_model import timeline_tasks
+from storage.shared_dataset import SHARED_DATASET, dataset_path, map_dataset
+from storage.rollups import build_rollups, is_current, load_rollups, summary, today
+from timeline.filters import dropdown_options, get_task_index
+from timeline.figure_cache import FigureCache
+from timeline.lod import MAX_BARS, timeline_rows
+from timeline.rows import SUMMARY_VIEWS
+from timeline.figure import timeline_figure
+from timeline.formatting import format_hover
+from monitoring.metrics import record, span
+
+# Data side of the dashboard. timeline_app imports it on the first request
+# that needs the tasks, so pandas and the dataset stay off the worker boot.
+
+FILTER_COLUMNS = ["status", "priority", "assignee"]
+
+
+def read_data():
+    return timeline_tasks(load_tasks())
+
+
+if SHARED_DATASET:
+    # Every worker maps the Arrow file published by the sync instead of parsing its own copy.
+    # Until then the cache follows the task store that map_dataset falls back to.
+    dataset_cache = DatasetCache(map_dataset, dataset_path)
+else:
+    dataset_cache = DatasetCache(read_data, store_path)
+figure_cache = FigureCache()
+
+
+def preload_data():
+    # Runs in the refresh thread: the new file is loaded before the UI asks for it
+    dataset_cache.invalidate()
+    load_snapshot()
+
+
+def load_snapshot():
+    try:
+        with span("load_data"):
+            return dataset_cache.snapshot()
+    except Exception as e:
+        print("Erreur chargement données:", e)
+        return None, pd.DataFrame()
+
+
+def load_data():
+    return load_snapshot()[1]
+
+
+_options_lock = threading.Lock()
+_options_entry = (None, None)
+
+
+def filter_options():
+    """Options of the filter dropdowns by column, computed once per dataset version."""
+    global _options_entry
+    version, df = load_snapshot()
+    with _options_lock:
+        if _options_entry[0] != version or _options_entry[1] is None:
+            options = {column: dropdown_options(df[column]) if column in df else [] for column in FILTER_COLUMNS}
+            _options_entry = (version, options)
+        return _options_entry[1]
+
+
+_rollups_lock = threading.Lock()
+_rollups_entry = (None, None, {})
+
+
+def level_summary(version, df, level):
+    """Rollup summary of ``level`` for the dataset ``version``, computed once per version and day.
+
+    It comes from the index kept up to date by the sync, or is added up from
+    ``df`` when that index is missing or does not match the dataset.
+    """
+    global _rollups_entry
+    key = (version, today())
+    with _rollups_lock:
+        if _rollups_entry[0] != key:
+            rollups = load_rollups()
+            if not is_current(rollups, df):
+                rollups = build_rollups(df)
+            _rollups_entry = (key, rollups, {})
+        _, rollups, levels = _rollups_entry
+        if level not in levels:
+            levels[level] = summary(rollups, level)
+        return levels[level]
+
+
+def get_time_settings(granularity):
+    if granularity == "daily":
+        return {"tickformat": "%d/%m", "dtick": "D1", "tickangle": -90}
+    elif granularity == "weekly":
+        return {"tickformat": "Semaine %W\n%Y", "dtick": 604800000, "tickangle": 0}
+    elif granularity == "monthly":
+        return {"tickformat": "%b %Y", "dtick": "M1", "tickangle": 0}
+    elif granularity == "quarterly":
+        return {"tickformat": "%b %Y", "dtick": "M3", "tickangle": 0}
+    elif granularity == "yearly":
+        return {"tickformat": "%Y", "dtick": "M12", "tickangle": 0}
+    return {}
+
+
+def build_figure(df, version, granularity, view_mode, assignee_val, priority_val, status_val, window=None, page=0):
+    # Filter the source rows first, then build rows only for what is shown:
+    # one page of the tasks of the visible window, or the groups of a summary
+    # view, aggregated when they exceed MAX_BARS
+    with span("filter"):
+        index = get_task_index(version, df)
+        mask = index.mask(assignee_val, priority_val, status_val)
+    record("rows", len(df) if mask is None else int(mask.sum()))
+    by = "assignee" if assignee_val else "list"
+    filters = tuple(tuple(sorted(values or [])) for values in (assignee_val, priority_val, status_val))
+    with span("rows"):
+        groups = level_summary(version, df, SUMMARY_VIEWS[view_mode]) if view_mode in SUMMARY_VIEWS else None
+        data, aggregated, pages = timeline_rows(df, index, view_mode, granularity, mask=mask, window=window, by=by,
+                                                key=(filters, tuple(window or [])), page=page, groups=groups)
+        if data.empty and window:
+            # Nothing in the zoomed range: show the whole timeline again
+            window = None
+            data, aggregated, pages = timeline_rows(df, index, view_mode, granularity, mask=mask, by=by,
+                                                    key=(filters, ()), page=page, groups=groups)
+    if data.empty:
+        return {}, "Aucune tâche ne correspond aux filtres.", "", 1, False
+    record("bars", len(data))
+    notice = ""
+    if aggregated:
+        notice = f"🔎 Plus de {MAX_BARS} barres : tâches regroupées par {'personne' if by == 'assignee' else 'projet'}, zoomez pour les détailler."
+    selected = df if mask is None else df[mask]
+    full_range = [selected["start_date"].min() - pd.Timedelta(days=2), selected["due_date"].max() + pd.Timedelta(days=2)]
+    time_cfg = get_time_settings(granularity)
+    with span("format"):
+        data = format_hover(data)
+    x_range = [pd.Timestamp(window[0]), pd.Timestamp(window[1])] if window else full_range
+    with span("figure"):
+        fig = timeline_figure(data, time_cfg, x_range, full_range)
+    return fig, "", notice, pages, aggregated
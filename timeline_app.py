@@ -1,445 +1,204 @@
-import plotly.express as px
-from dash import Dash, dcc, html, Input, Output, callback_context
+from dash import Dash, Patch, dcc, html, Input, Output, State, callback_context, no_update
 import dash_bootstrap_components as dbc
 import datetime as dt
-import pandas as pd
-import subprocess, sys, os
+import os
 import dash_auth
 from dotenv import load_dotenv
+from timeline.refresh import RefreshManager, describe
+from monitoring.metrics import instrument_server
 
-load_dotenv()
+# pandas, the task store and the ClickUp client are imported by the callbacks
+# on first use (timeline.view, tasks.sync_tasks): a worker boots without them
+# and without reading the dataset, and still starts when the file is missing.
 
-TIMELINE_COLOR_SEQUENCE = [
-    "#FFB347", "#AEC6CF", "#77DD77", "#CBAACB", "#FFD1DC",
-    "#FDFD96", "#B39EB5", "#FF6961", "#03C03C", "#779ECB"
-]
+load_dotenv()
 
-def load_data():
+def run_sync():
+    # A sync already running (daemon, CLI, another worker) is joined: its
+    # progress shows through the status file and its dataset is picked up
+    # by the next poll.
+    from tasks.sync_tasks import SyncInProgress, sync_tasks
     try:
-        df = pd.read_excel("all_clickup_tasks_with_subtasks.xlsx")
-        df = df.dropna(subset=["start_date", "due_date"])
-        df["start_date"] = pd.to_datetime(df["start_date"])
-        df["due_date"] = pd.to_datetime(df["due_date"])
-        return df
-    except Exception as e:
-        print("Erreur chargement données:", e)
-        return pd.DataFrame()
-
-def build_timeline_data(df, view_mode):
-    status = {
-        "to do": "📝", "selected for development": "🚦", "in progress": "⏳",
-        "on hold": "⏸️", "review": "🔍", "done": "🆗", "complete": "🎉",
-    }
-    priority = {
-        "urgent": "🔴", "high": "🟠", "normal": "🔵", "low": "⚪",
-    }
-    rows = []
-    for list_name in df["list"].unique():
-        group = df[df["list"] == list_name]
-        if view_mode == "Project 📁 ":
-            rows.append({
-                "y_label": f"📦 {list_name}",
-                "start": group["start_date"].min(),
-                "end": group["due_date"].max(),
-                "Project 📁 ": list_name,
-                "assignee": "", "priority": "", "status": "",
-                "label": f"📁 <b>{list_name}</b>", "textposition": "inside"
-            })
-        tasks = group[group["type"] == "task"].sort_values("start_date")
-        for _, task_row in tasks.iterrows():
-            assignees = task_row.get("assignee", "")
-            initials = ", ".join(["".join([p[0].upper() for p in a.strip().split()[:2]]) for a in assignees.split(",") if a.strip()]) if assignees else "NA"
-            label = task_row["task_name"]
-            textposition = "inside" if len(label) <= 25 else "outside"
-            if view_mode in ["task", "detailed"]:
-                y_label = f"{initials} | {status.get(task_row.get('status', '').lower(), '')} | {priority.get(task_row.get('priority', '').lower(), '')}"
-                if task_row.get("task_id"):
-                    y_label += f" | <span style='color:rgba(0,0,0,0.15)'>{task_row['task_id']}</span>"
-                rows.append({
-                    "y_label": y_label,
-                    "start": task_row["start_date"],
-                    "end": task_row["due_date"],
-                    "Project 📁 ": task_row["list"],
-                    "assignee": assignees,
-                    "priority": task_row.get("priority", "Non précisée"),
-                    "status": task_row.get("status", "Non défini"),
-                    "label": label,
-                    "textposition": textposition
-                })
-            if view_mode == "detailed":
-                subtasks = group[(group["type"] == "subtask") & (group["parent_id"] == task_row["task_id"])]
-                for _, sub_row in subtasks.sort_values("start_date").iterrows():
-                    assignees = sub_row.get("assignee", "")
-                    initials = ", ".join(["".join([p[0].upper() for p in a.strip().split()[:2]]) for a in assignees.split(",") if a.strip()]) if assignees else "NA"
-                    sub_label_text = sub_row["task_name"]
-                    textposition = "inside" if len(sub_label_text) <= 25 else "outside"
-                    rows.append({
-                        "y_label": f"{initials} | {status.get(sub_row.get('status', '').lower(), '')} | {priority.get(sub_row.get('priority', '').lower(), '')} | {sub_row['task_id']}",
-                        "start": sub_row["start_date"],
-                        "end": sub_row["due_date"],
-                        "Project 📁 ": sub_row["list"],
-                        "assignee": assignees,
-                        "priority": sub_row.get("priority", "Non précisée"),
-                        "status": sub_row.get("status", "Non défini"),
-                        "label": sub_label_text,
-                        "textposition": textposition
-                    })
-    return pd.DataFrame(rows)
-
-def get_time_settings(granularity):
-    if granularity == "daily":
-        return {"tickformat": "%d/%m", "dtick": "D1", "tickangle": -90}
-    elif granularity == "weekly":
-        return {"tickformat": "Semaine %W\n%Y", "dtick": 604800000, "tickangle": 0}
-    elif granularity == "monthly":
-        return {"tickformat": "%b %Y", "dtick": "M1", "tickangle": 0}
-    elif granularity == "quarterly":
-        return {"tickformat": "%b %Y", "dtick": "M3", "tickangle": 0}
-    elif granularity == "yearly":
-        return {"tickformat": "%Y", "dtick": "M12", "tickangle": 0}
-    return {}
-
-# --- Dash Layout ---
-app = Dash(__name__, external_stylesheets=[dbc.themes.LUX])
-
-VALID_USERNAME_PASSWORD_PAIRS = {
-    os.getenv("DASH_USERNAME"): os.getenv("DASH_PASSWORD")
-}
-
-auth = dash_auth.BasicAuth(
-    app,
-    VALID_USERNAME_PASSWORD_PAIRS
-)
-
-app.title = "Timeline ClickUp Interactive"
-
-df_loaded = load_data()
-
-def dropdown_options(col):
-    unique_names = set()
-    for assignees in df_loaded[col].dropna():
-        for name in assignees.split(","):
-            clean = name.strip()
-            if clean:
-                unique_names.add(clean)
-    return [{"label": name, "value": name} for name in sorted(unique_names)]
-
-
-sidebar = dbc.Card(
-    [
-        html.H5("Filters", className="text-center mb-3", style={"fontSize": "0.92rem"}),
-        html.Div(style={"height": "8px"}),
-
-        dbc.Label("🗓️ Time View", style={"fontSize": "0.78rem"}),
-        html.Div(style={"height": "10px"}),
-        dcc.Dropdown(
-            id="granularity",
-            options=[
-                {"label": "Daily", "value": "daily"},
-                {"label": "Weekly", "value": "weekly"},
-                {"label": "Monthly", "value": "monthly"},
-                {"label": "Quarterly", "value": "quarterly"},
-                {"label": "Yearly", "value": "yearly"},
-            ],
-            value="monthly",
-            clearable=False,
-            className="mb-2",
-            style={"fontSize": "0.78rem", "height": "24px"}
-        ),
-        html.Div(style={"height": "30px"}),
-
-        dbc.Label("➕ Detail Level", style={"fontSize": "0.78rem"}),
-        html.Div(style={"height": "4px"}),
-        dcc.Dropdown(
-            id="view-mode",
-            options=[
-                {"label": "Detailed (tasks + subtasks)", "value": "detailed"},
-                {"label": "By task (no subtasks)", "value": "task"},
-                {"label": "By project only", "value": "Project 📁 "},
-            ],
-            value="detailed",
-            clearable=False,
-            className="mb-2",
-            style={"fontSize": "0.78rem", "height": "24px"}
-        ),
-        html.Div(style={"height": "30px"}),
-
-        dbc.Label("📶 Status", style={"fontSize": "0.78rem"}),
-        html.Div(style={"height": "4px"}),
-        dcc.Dropdown(
-            id="status-filter",
-            options=dropdown_options("status"),
-            multi=True,
-            className="mb-2",
-            style={"fontSize": "0.78rem", "height": "24px"}
-        ),
-        html.Div(style={"height": "16px"}),
-
-
-        dbc.Label("🚩 Priority", style={"fontSize": "0.78rem"}),
-        html.Div(style={"height": "4px"}),
-        dcc.Dropdown(
-            id="priority-filter",
-            options=dropdown_options("priority"),
-            multi=True,
-            className="mb-2",
-            style={"fontSize": "0.78rem", "height": "24px"}
-        ),
-        html.Div(style={"height": "30px"}),
-
-        dbc.Label("🙍‍♂️ / 🙍‍♀️ Assigned to", style={"fontSize": "0.78rem"}),
-        html.Div(style={"height": "4px"}),
-        dcc.Dropdown(
-            id="assignee-filter",
-            options=dropdown_options("assignee"),
-            multi=True,
-            className="mb-2",
-            style={"fontSize": "0.78rem", "height": "24px"}
-        ),
-        html.Div(style={"height": "30px"}),
-
-        dbc.Button(
-            "🔄 Refresh",
-            id="refresh-button",
-            color="primary",
-            className="w-100 mt-2 refresh-anim",
-            style={
-                "fontSize": "0.75rem",
-                "padding": "7px 0",
-                "background": "linear-gradient(90deg, #4f8cff 0%, #38c6ff 100%)",
-                "border": "none",
-                "borderRadius": "8px",
-                "boxShadow": "0 2px 8px rgba(80,140,255,0.12)",
-                "fontWeight": "bold",
-                "letterSpacing": "0.03em",
-                "transition": "background 0.2s, box-shadow 0.2s, transform 0.2s",
-                "color": "#fff"
-            }
-        ),
-        # CSS animation for the button (see assets/refresh_anim.css)
-    ],
-    body=True,
-    className="shadow-sm",
-    style={
-        "minWidth": "210px",
-        "height": "100vh",
-        "position": "fixed",
-        "top": 0,
-        "left": 0,
-        "zIndex": 1000,
-        "background": "#fff",
-        "padding": "10px 8px"
-    }
-)
-
-app.layout = dbc.Container(
-    [
-        dbc.Row([
-            dbc.Col(sidebar, width=2, style={"paddingRight": 0, "maxWidth": "210px"}),
-            dbc.Col(
-                [
-                    html.Div(style={"height": "2px"}),
-                    html.H4(
-                        "📊 Vue Timeline des projets Dusens Research",
-                        className="text-center my-3",
-                        style={"fontSize": "1.1rem"}
-                    ),
-                    dcc.Loading(
-                        id="loading-graph",
-                        type="circle",
-                        fullscreen=True,
-                        children=[
-                            dcc.Graph(id="timeline-graph"),
-                            html.Div(id="error-message", className="text-danger mt-2", style={"fontSize": "0.95rem"})
-                        ]
-                    ),
+        return sync_tasks()
+    except SyncInProgress:
+        return None
+
+def preload_data():
+    from timeline import view
+    view.preload_data()
+
+refresh_manager = RefreshManager(run_sync, on_done=preload_data)
+
+def build_sidebar():
+    return dbc.Card(
+        [
+            html.H5("Filters", className="text-center mb-3", style={"fontSize": "0.92rem"}),
+            html.Div(style={"height": "8px"}),
+
+            dbc.Label("🗓️ Time View", style={"fontSize": "0.78rem"}),
+            html.Div(style={"height": "10px"}),
+            dcc.Dropdown(
+                id="granularity",
+                options=[
+                    {"label": "Daily", "value": "daily"},
+                    {"label": "Weekly", "value": "weekly"},
+                    {"label": "Monthly", "value": "monthly"},
+                    {"label": "Quarterly", "value": "quarterly"},
+                    {"label": "Yearly", "value": "yearly"},
                 ],
-                width=10,
-                style={"marginLeft": "210px"}
+                value="monthly",
+                clearable=False,
+                className="mb-2",
+                style={"fontSize": "0.78rem", "height": "24px"}
             ),
-        ], className="g-0"),
-    ],
-    fluid=True,
-    style={"background": "#f4f6fa", "minHeight": "100vh", "paddingLeft": "0px"}
-)
-
-@app.callback(
-    Output("timeline-graph", "figure"),
-    Output("error-message", "children"),
-    Input("granularity", "value"),
-    Input("view-mode", "value"),
-    Input("assignee-filter", "value"),
-    Input("priority-filter", "value"),
-    Input("status-filter", "value"),
-    Input("refresh-button", "n_clicks")
-)
-def update_graph(granularity, view_mode, assignee_val, priority_val, status_val, n_clicks):
-    error = ""
-    triggered = [t["prop_id"] for t in callback_context.triggered]
-    if "refresh-button.n_clicks" in triggered and n_clicks:
-        try:
-            subprocess.run([
-                sys.executable, "tasks/get_all_tasks_with_subtasks.py"
-            ], check=True, cwd=os.path.dirname(__file__), env={**os.environ, "PYTHONPATH": os.path.abspath(".")})
-        except Exception as e:
-            error = f"Erreur lors de l'actualisation : {e}"
-    df = load_data()
-    if df.empty:
-        return {}, "Aucune donnée disponible."
-    data = build_timeline_data(df, view_mode)
-    if assignee_val:
-        def matches_assignee(row_assignee):
-            if not isinstance(row_assignee, str):
-                return False
-            row_names = [name.strip() for name in row_assignee.split(",")]
-            return any(val in row_names for val in assignee_val)
-
-        data = data[data["assignee"].apply(matches_assignee)]
-
-
-    if priority_val:
-        data = data[data["priority"].isin(priority_val)]
-    if status_val:
-        data = data[data["status"].isin(status_val)]
-    if data.empty:
-        return {}, "Aucune tâche ne correspond aux filtres."
-    time_cfg = get_time_settings(granularity)
-    status_icons = {
-        "to do": "📝", "selected for development": "🚦", "in progress": "⏳",
-        "on hold": "⏸️", "review": "🔍", "done": "🆗", "complete": "🎉",
-    }
-    priority_icons = {
-        "urgent": "🔴", "high": "🟠", "normal": "🔵", "low": "⚪",
-    }
-
-    def assignee_with_icon(row):
-        assignees = row.get("assignee", "")
-        if not assignees:
-            return "NA"
-        return ", ".join(
-            ["" + "".join([p[0].upper() for p in a.strip().split()[:2]]) for a in assignees.split(",") if a.strip()]
-        )
-
-    def status_with_icon(row):
-        val = str(row.get("status", "")).lower()
-        return f"{status_icons.get(val, '')} {row.get('status', '')}"
-
-    def priority_with_icon(row):
-        val = str(row.get("priority", "")).lower()
-        return f"{priority_icons.get(val, '')} {row.get('priority', '')}"
-
-    def start_with_icon(row):
-        val = row.get("start", "")
-        return f"{val.strftime('%Y-%m-%d') if pd.notnull(val) else ''}"
-
-    def end_with_icon(row):
-        val = row.get("end", "")
-        return f"{val.strftime('%Y-%m-%d') if pd.notnull(val) else ''}"
-
-    data["status"] = data.apply(status_with_icon, axis=1)
-    data["priority"] = data.apply(priority_with_icon, axis=1)
-    data["assignee"] = data.apply(assignee_with_icon, axis=1)
-    data["start date"] = data.apply(start_with_icon, axis=1)
-    data["due date"] = data.apply(end_with_icon, axis=1)
+            html.Div(style={"height": "30px"}),
+
+            dbc.Label("➕ Detail Level", style={"fontSize": "0.78rem"}),
+            html.Div(style={"height": "4px"}),
+            dcc.Dropdown(
+                id="view-mode",
+                options=[
+                    {"label": "Detailed (tasks + subtasks)", "value": "detailed"},
+                    {"label": "By task (no subtasks)", "value": "task"},
+                    {"label": "By project only", "value": "Project 📁 "},
+                    {"label": "By space only", "value": "Space 🗂️ "},
+                    {"label": "By assignee only", "value": "Assignee 🙍 "},
+                ],
+                value="detailed",
+                clearable=False,
+                className="mb-2",
+                style={"fontSize": "0.78rem", "height": "24px"}
+            ),
+            html.Div(style={"height": "30px"}),
+
+            dbc.Label("📶 Status", style={"fontSize": "0.78rem"}),
+            html.Div(style={"height": "4px"}),
+            dcc.Dropdown(
+                id="status-filter",
+                options=[],
+                multi=True,
+                className="mb-2",
+                style={"fontSize": "0.78rem", "height": "24px"}
+            ),
+            html.Div(style={"height": "16px"}),
 
-    data["task_name"] = "📝 " + data["label"]
 
-    fig = px.timeline(
-        data,
-        x_start="start",
-        x_end="end",
-        y="y_label",
-        color="Project 📁 ",
-        hover_data={"start": False, "end": False, "y_label": False},
-        custom_data=["task_name", "Project 📁 ", "assignee", "priority", "status", "start date", "due date"],
-        color_discrete_sequence=TIMELINE_COLOR_SEQUENCE,
-        text="task_name"
+            dbc.Label("🚩 Priority", style={"fontSize": "0.78rem"}),
+            html.Div(style={"height": "4px"}),
+            dcc.Dropdown(
+                id="priority-filter",
+                options=[],
+                multi=True,
+                className="mb-2",
+                style={"fontSize": "0.78rem", "height": "24px"}
+            ),
+            html.Div(style={"height": "30px"}),
+
+            dbc.Label("🙍‍♂️ / 🙍‍♀️ Assigned to", style={"fontSize": "0.78rem"}),
+            html.Div(style={"height": "4px"}),
+            dcc.Dropdown(
+                id="assignee-filter",
+                options=[],
+                multi=True,
+                className="mb-2",
+                style={"fontSize": "0.78rem", "height": "24px"}
+            ),
+            html.Div(style={"height": "30px"}),
+
+            dbc.Button(
+                "🔄 Refresh",
+                id="refresh-button",
+                color="primary",
+                className="w-100 mt-2 refresh-anim",
+                style={
+                    "fontSize": "0.75rem",
+                    "padding": "7px 0",
+                    "background": "linear-gradient(90deg, #4f8cff 0%, #38c6ff 100%)",
+                    "border": "none",
+                    "borderRadius": "8px",
+                    "boxShadow": "0 2px 8px rgba(80,140,255,0.12)",
+                    "fontWeight": "bold",
+                    "letterSpacing": "0.03em",
+                    "transition": "background 0.2s, box-shadow 0.2s, transform 0.2s",
+                    "color": "#fff"
+                }
+            ),
+            # CSS animation for the button (see assets/refresh_anim.css)
+            html.Div(id="refresh-status", className="text-muted mt-2", style={"fontSize": "0.7rem"}),
+            html.Div(id="last-synced", className="text-muted", style={"fontSize": "0.7rem"}),
+            dcc.Interval(id="refresh-interval", interval=1000, disabled=True),
+            dcc.Interval(id="sync-status-interval", interval=60 * 1000),
+            dcc.Store(id="dataset-version"),
+            dcc.Store(id="visible-window"),
+            dcc.Store(id="figure-aggregated"),
+        ],
+        body=True,
+        className="shadow-sm",
+        style={
+            "minWidth": "210px",
+            "height": "100vh",
+            "position": "fixed",
+            "top": 0,
+            "left": 0,
+            "zIndex": 1000,
+            "background": "#fff",
+            "padding": "10px 8px"
+        }
     )
 
-    fig.update_traces(textposition="outside", width=0.2)
-
-    fig.update_traces(
-    hovertemplate=(
-        "📌 Task: %{customdata[0]}<br>"
-        "📁 Project: %{customdata[1]}<br>"
-        "📶 Status: %{customdata[4]}<br>"
-        "🚩 Priority: %{customdata[3]}<br>"
-        "🙍 Assigned to: %{customdata[2]}<br>"
-        "🚀 Start: %{customdata[5]}<br>"
-        "🏁 End: %{customdata[6]}<extra></extra>"
+def build_layout():
+    return dbc.Container(
+        [
+            dbc.Row([
+                dbc.Col(build_sidebar(), width=2, style={"paddingRight": 0, "maxWidth": "210px"}),
+                dbc.Col(
+                    [
+                        html.Div(style={"height": "2px"}),
+                        html.H4(
+                            "📊 Vue Timeline des projets Dusens Research",
+                            className="text-center my-3",
+                            style={"fontSize": "1.1rem"}
+                        ),
+                        dcc.Loading(
+                            id="loading-graph",
+                            type="circle",
+                            fullscreen=True,
+                            children=[
+                                dcc.Graph(id="timeline-graph"),
+                                html.Div(id="lod-status", className="text-muted mt-1", style={"fontSize": "0.75rem"}),
+                                dbc.Pagination(
+                                    id="row-page",
+                                    active_page=1,
+                                    max_value=1,
+                                    fully_expanded=False,
+                                    first_last=True,
+                                    previous_next=True,
+                                    size="sm",
+                                    className="mt-2",
+                                    style={"display": "none"}
+                                ),
+                                html.Div(id="error-message", className="text-danger mt-2", style={"fontSize": "0.95rem"})
+                            ]
+                        ),
+                    ],
+                    width=10,
+                    style={"marginLeft": "210px"}
+                ),
+            ], className="g-0"),
+        ],
+        fluid=True,
+        style={"background": "#f4f6fa", "minHeight": "100vh", "paddingLeft": "0px"}
     )
-)
 
-    fig.update_traces(textposition="outside")
-    fig.update_yaxes(autorange="reversed", tickfont=dict(size=10))
-    fig.add_vline(
-        x=dt.datetime.today(),
-        line_width=.3,
-        line_dash="dash",
-        line_color="red"
-    )
-    fig.update_layout(
-        height=800,
-        width=1200,
-        bargap=0.2,
-        margin=dict(l=260, r=40, t=70, b=40),
-        yaxis_title=None,
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="rgba(248,249,250,0.91)",
-        font=dict(family="Segoe UI, Arial, sans-serif", size=13, color="#222"),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor="#e5e7eb",
-            tickformat=time_cfg["tickformat"],
-            tickangle=time_cfg.get("tickangle", 0),
-            tickmode="linear",
-            tick0=data["start"].min(),
-            dtick=time_cfg["dtick"],
-            rangeslider_visible=True,
-            range=[data["start"].min() - pd.Timedelta(days=2), data["end"].max() + pd.Timedelta(days=2)],
-            linecolor="#adb5bd",
-            linewidth=1,
-            mirror=True,
-            showline=True,
-            ticks="outside",
-            tickfont=dict(size=12, color="#444"),
-        ),
-        # yaxis=dict(tickfont=dict(size=10), automargin=True),
-        yaxis=dict(
-            
-            showgrid=False,
-            linecolor="#adb5bd",
-            linewidth=1,
-            mirror=True,
-            showline=True,
-            ticks="outside",
-            tickfont=dict(size=12, color="#444"),
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor="rgba(255,255,255,0.8)",
-            bordercolor="#dee2e6",
-            borderwidth=1,
-            font=dict(size=12)
-        ),
-        title=dict(
-            font=dict(size=22, color="#222"),
-            x=0.5,
-            xanchor="center"
-        ),
-        hoverlabel=dict(
-            bgcolor="#fff",
-            font_size=13,
-            font_family="Segoe UI, Arial, sans-serif",
-            bordercolor="#adb5bd"
-        ),
-        dragmode=False
-    )
-    legend_html = html.Div([
+def last_synced_text():
+    from tasks.sync_tasks import load_status
+    last_synced = load_status().get("last_synced")
+    if not last_synced:
+        return "🕓 Jamais synchronisé"
+    return f"🕓 Dernière synchro : {dt.datetime.fromtimestamp(last_synced).strftime('%d/%m %H:%M')}"
+
+def legend_html():
+    return html.Div([
         html.B("📶 Statut"),
         html.Br(),
         html.Span("  📝 to do"), html.Br(),
@@ -470,8 +229,135 @@ def update_graph(granularity, view_mode, assignee_val, priority_val, status_val,
         "opacity": 0.97,
         "maxWidth": "220px"
     })
-    
-    return fig, legend_html if not error else error
+
+def track_window(relayout, current):
+    from timeline.lod import visible_window
+    window = visible_window(relayout)
+    if window is None or window == current:
+        return no_update
+    return None if window == "reset" else window
+
+def update_filter_options(dataset_version):
+    # The choices follow the dataset: recomputed once per version, not at import
+    from timeline.view import filter_options
+    options = filter_options()
+    return options["status"], options["priority"], options["assignee"]
+
+def update_graph(granularity, view_mode, assignee_val, priority_val, status_val, dataset_version, window, active_page,
+                 aggregated):
+    from timeline import view
+    from timeline.figure import xaxis_ticks
+    from timeline.figure_cache import figure_key
+    triggered = [t["prop_id"] for t in callback_context.triggered]
+    if triggered == ["granularity.value"] and aggregated is False:
+        # Only the ticks depend on the granularity when tasks are shown one by one
+        patch = Patch()
+        for name, value in xaxis_ticks(view.get_time_settings(granularity)).items():
+            patch["layout"]["xaxis"][name] = value
+        return patch, no_update, no_update, no_update, no_update, no_update, no_update
+
+    # Any other change than the page control or the granularity starts again from the first page
+    page = (active_page or 1) - 1 if triggered in (["row-page.active_page"], ["granularity.value"]) else 0
+    version, df = view.load_snapshot()
+    if df.empty:
+        return {}, "Aucune donnée disponible.", "", 1, 1, {"display": "none"}, None
+    key = figure_key(version, granularity, view_mode, assignee_val, priority_val, status_val, window, page)
+    fig, message, notice, pages, aggregated = view.figure_cache.get_or_build(
+        key, lambda: view.build_figure(df, version, granularity, view_mode, assignee_val, priority_val, status_val,
+                                       window, page)
+    )
+    pager_style = {"display": "none"} if pages <= 1 else {}
+    page = min(page, pages - 1)
+    if message:
+        return fig, message, notice, pages, page + 1, pager_style, None
+    return fig, legend_html(), notice, pages, page + 1, pager_style, aggregated
+
+def refresh_data(n_clicks, n_intervals, status_intervals, known_version):
+    # Start (or join) the background sync and poll it. The slow interval also
+    # picks up datasets published by the sync daemon or another worker; the
+    # graph only redraws once a new dataset has been swapped in.
+    from timeline import view
+    from tasks.sync_tasks import load_status
+    triggered = [t["prop_id"] for t in callback_context.triggered]
+    clicked = "refresh-button.n_clicks" in triggered and n_clicks
+    if clicked:
+        refresh_manager.start()
+    # The status file is shared by every worker: whichever one answers the
+    # poll reports the same sync. Right after a click the sync may not have
+    # written it yet, so polling starts anyway.
+    status = load_status()
+    running = bool(status.get("running"))
+    # The version names the dataset file, so every worker reports the same
+    # one; it is only read once the sync has swapped in the new file.
+    version = no_update if running else view.load_snapshot()[0]
+    return (
+        not (running or clicked),
+        describe(status),
+        last_synced_text(),
+        version if version != known_version else no_update,
+    )
+
+def register_callbacks(app):
+    app.callback(
+        Output("visible-window", "data"),
+        Input("timeline-graph", "relayoutData"),
+        State("visible-window", "data")
+    )(track_window)
+
+    app.callback(
+        Output("status-filter", "options"),
+        Output("priority-filter", "options"),
+        Output("assignee-filter", "options"),
+        Input("dataset-version", "data")
+    )(update_filter_options)
+
+    app.callback(
+        Output("timeline-graph", "figure"),
+        Output("error-message", "children"),
+        Output("lod-status", "children"),
+        Output("row-page", "max_value"),
+        Output("row-page", "active_page"),
+        Output("row-page", "style"),
+        Output("figure-aggregated", "data"),
+        Input("granularity", "value"),
+        Input("view-mode", "value"),
+        Input("assignee-filter", "value"),
+        Input("priority-filter", "value"),
+        Input("status-filter", "value"),
+        Input("dataset-version", "data"),
+        Input("visible-window", "data"),
+        Input("row-page", "active_page"),
+        State("figure-aggregated", "data")
+    )(update_graph)
+
+    app.callback(
+        Output("refresh-interval", "disabled"),
+        Output("refresh-status", "children"),
+        Output("last-synced", "children"),
+        Output("dataset-version", "data"),
+        Input("refresh-button", "n_clicks"),
+        Input("refresh-interval", "n_intervals"),
+        Input("sync-status-interval", "n_intervals"),
+        State("dataset-version", "data")
+    )(refresh_data)
+
+def create_app():
+    """Build the Dash app, with its layout and callbacks.
+
+    Nothing is read here: the dataset is loaded by the first callback that
+    needs it, and the filter choices follow each new dataset version. The
+    Flask server behind it serves its metrics on ``/metrics``, outside the
+    basic auth so Prometheus can scrape it: it holds request counts and
+    timings, no task data.
+    """
+    app = Dash(__name__, external_stylesheets=[dbc.themes.LUX])
+    dash_auth.BasicAuth(app, {os.getenv("DASH_USERNAME"): os.getenv("DASH_PASSWORD")}, public_routes=["/metrics"])
+    app.title = "Timeline ClickUp Interactive"
+    app.layout = build_layout()
+    register_callbacks(app)
+    instrument_server(app.server)
+    return app
+
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,5 @@
+# Production entry point, e.g.: gunicorn -w 4 -b 0.0.0.0:8050 wsgi:server
+from timeline_app import create_app
+
+app = create_app()
+server = app.server